@@ -0,0 +1,48 @@
+import hashlib
+import os
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+LIST_CACHE_TIMEOUT = 60  # seconds
+# The per-user list version must be shared by every worker, so list caching is
+# off on process-local backends (LocMemCache when REDIS_URL is unset)
+LIST_CACHE_ENABLED = settings.CACHES['default']['BACKEND'] not in (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+PREVIEW_CACHE_TIMEOUT = 60 * 60  # seconds
+
+
+def _list_version_key(user_id):
+    return f'analytics:list-version:{user_id}'
+
+
+def get_list_version(user_id):
+    """Current list cache version for a user.
+
+    Seeded from the clock so that an evicted version key can never roll back
+    to a value that still has cached entries.
+    """
+    return cache.get_or_set(_list_version_key(user_id), time.time_ns, None)
+
+
+def bump_list_version(user_id):
+    """Invalidate every cached list response for a user"""
+    if not LIST_CACHE_ENABLED:
+        return
+    try:
+        cache.incr(_list_version_key(user_id))
+    except ValueError:
+        cache.set(_list_version_key(user_id), time.time_ns(), None)
+
+
+def list_cache_key(basename, user_id, full_path):
+    path_hash = hashlib.md5(full_path.encode()).hexdigest()
+    return f'analytics:list:{basename}:{user_id}:{get_list_version(user_id)}:{path_hash}'
+
+
+def preview_cache_key(dataset_id, file_path):
+    """Preview responses only depend on the stored file, so key them on its mtime"""
+    return f'analytics:preview:{dataset_id}:{os.stat(file_path).st_mtime_ns}'
@@ -0,0 +1,24 @@
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = 'Collect static files and apply migrations in a single Django process'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--noinput', '--no-input', action='store_false', dest='interactive',
+            help='Do NOT prompt the user for input of any kind',
+        )
+        parser.add_argument(
+            '--clear', action='store_true',
+            help='Clear existing files in STATIC_ROOT before collecting',
+        )
+
+    def handle(self, *args, **options):
+        interactive = options['interactive']
+        verbosity = options['verbosity']
+        self.stdout.write('Collecting static files...')
+        call_command('collectstatic', interactive=interactive, clear=options['clear'], verbosity=verbosity)
+        self.stdout.write('Running database migrations...')
+        call_command('migrate', interactive=interactive, verbosity=verbosity)
@@ -0,0 +1,40 @@
+import logging
+import time
+from contextlib import ExitStack
+
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+
+class QueryCountMiddleware:
+    """Development aid: count the SQL queries each request runs.
+
+    Reports them in ``X-DB-Query-Count``/``X-DB-Query-Time`` response headers
+    and a log line. Only installed when DEBUG is on.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        stats = {'count': 0, 'duration': 0.0}
+
+        def count_query(execute, sql, params, many, context):
+            start = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                stats['count'] += 1
+                stats['duration'] += time.perf_counter() - start
+
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(count_query))
+            response = self.get_response(request)
+
+        duration_ms = stats['duration'] * 1000
+        response['X-DB-Query-Count'] = str(stats['count'])
+        response['X-DB-Query-Time'] = f'{duration_ms:.1f}ms'
+        logger.info('%s %s: %d queries in %.1fms', request.method, request.path, stats['count'], duration_ms)
+        return response
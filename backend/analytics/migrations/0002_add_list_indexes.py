@@ -0,0 +1,47 @@
+# Generated by Django 5.2.3 on 2026-10-15 22:14
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='analysis',
+            name='analysis_type',
+            field=models.CharField(choices=[('descriptive', 'Descriptive Statistics'), ('correlation', 'Correlation Analysis'), ('regression', 'Regression Analysis'), ('clustering', 'Clustering'), ('classification', 'Classification'), ('prediction', 'Prediction'), ('visualization', 'Data Visualization'), ('quick_analysis', 'Quick AI Analysis')], max_length=50),
+        ),
+        migrations.AlterField(
+            model_name='analysis',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+        migrations.AlterField(
+            model_name='dataset',
+            name='uploaded_at',
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+        migrations.AlterField(
+            model_name='visualization',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+        migrations.AddIndex(
+            model_name='analysis',
+            index=models.Index(fields=['dataset', '-created_at'], name='analysis_dataset_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dataset',
+            index=models.Index(fields=['uploaded_by', '-uploaded_at'], name='dataset_owner_uploaded_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='visualization',
+            index=models.Index(fields=['analysis', '-created_at'], name='viz_analysis_created_idx'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+from django.db import migrations
+
+
+# (table, column, index name) - GIN indexes using jsonb_path_ops so that
+# containment lookups (``parameters__contains={...}``) can use the index.
+JSONB_GIN_INDEXES = [
+    ('analytics_analysis', 'parameters', 'analysis_parameters_gin'),
+    ('analytics_visualization', 'config', 'viz_config_gin'),
+]
+
+
+def create_gin_indexes(apps, schema_editor):
+    """JSONField is only stored as jsonb on PostgreSQL; skip other backends"""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for table, column, name in JSONB_GIN_INDEXES:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {name} ON {table} USING gin ({column} jsonb_path_ops)'
+        )
+
+
+def drop_gin_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for _, _, name in JSONB_GIN_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0002_add_list_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_gin_indexes, drop_gin_indexes),
+    ]
@@ -0,0 +1,37 @@
+from django.db import DatabaseError, migrations, transaction
+
+
+# Large JSON columns that are read back on every detail request. LZ4 TOAST
+# compression decompresses much faster than the default pglz.
+LZ4_COLUMNS = [
+    ('analytics_analysis', 'results'),
+    ('analytics_visualization', 'config'),
+    ('analytics_visualization', 'data'),
+]
+
+
+def set_column_compression(method):
+    def apply(apps, schema_editor):
+        connection = schema_editor.connection
+        # Per-column compression needs PostgreSQL 14+ built with lz4
+        if connection.vendor != 'postgresql' or connection.pg_version < 140000:
+            return
+        for table, column in LZ4_COLUMNS:
+            try:
+                with transaction.atomic(using=connection.alias):
+                    schema_editor.execute(f'ALTER TABLE {table} ALTER COLUMN {column} SET COMPRESSION {method}')
+            except DatabaseError:
+                # Server built without lz4 support - keep the default codec
+                return
+    return apply
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0003_jsonb_gin_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(set_column_compression('lz4'), set_column_compression('pglz')),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.3 on 2026-10-15 22:16
+
+from django.db import migrations, models
+
+
+def backfill_file_size_mb(apps, schema_editor):
+    Dataset = apps.get_model('analytics', 'Dataset')
+    datasets = list(Dataset.objects.exclude(file_size=None).only('id', 'file_size'))
+    for dataset in datasets:
+        dataset.file_size_mb = round(dataset.file_size / (1024 * 1024), 2) if dataset.file_size else None
+    Dataset.objects.bulk_update(datasets, ['file_size_mb'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0004_lz4_json_compression'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dataset',
+            name='file_size_mb',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_file_size_mb, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.3 on 2026-10-15 22:17
+
+import analytics.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0005_dataset_file_size_mb'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='analysis',
+            name='id',
+            field=models.UUIDField(default=analytics.models.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='dataset',
+            name='id',
+            field=models.UUIDField(default=analytics.models.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='visualization',
+            name='id',
+            field=models.UUIDField(default=analytics.models.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+    ]
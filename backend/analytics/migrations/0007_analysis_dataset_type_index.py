@@ -0,0 +1,17 @@
+# Generated by Django 5.2.3 on 2026-10-15 22:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0006_uuid7_primary_keys'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='analysis',
+            index=models.Index(fields=['dataset', 'analysis_type', '-created_at'], name='analysis_ds_type_ct_idx'),
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.3 on 2026-10-15 22:19
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+# (table, text columns) kept in sync with search_vector by a trigger
+SEARCH_TABLES = [
+    ('analytics_dataset', ('name', 'description')),
+    ('analytics_analysis', ('title', 'description')),
+]
+
+
+def create_search_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for table, columns in SEARCH_TABLES:
+        column_list = ', '.join(columns)
+        document = " || ' ' || ".join(f"coalesce({column}, '')" for column in columns)
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {table}_search_gin ON {table} USING gin (search_vector)'
+        )
+        schema_editor.execute(
+            f'CREATE TRIGGER {table}_search_update BEFORE INSERT OR UPDATE OF {column_list} ON {table} '
+            f"FOR EACH ROW EXECUTE PROCEDURE tsvector_update_trigger(search_vector, 'pg_catalog.english', {column_list})"
+        )
+        schema_editor.execute(
+            f"UPDATE {table} SET search_vector = to_tsvector('pg_catalog.english', {document})"
+        )
+
+
+def drop_search_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for table, _ in SEARCH_TABLES:
+        schema_editor.execute(f'DROP TRIGGER IF EXISTS {table}_search_update ON {table}')
+        schema_editor.execute(f'DROP INDEX IF EXISTS {table}_search_gin')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0007_analysis_dataset_type_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='analysis',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='dataset',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_triggers, drop_search_triggers),
+    ]
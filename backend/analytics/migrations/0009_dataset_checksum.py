@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-15 22:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0008_search_vectors'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dataset',
+            name='checksum',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+    ]
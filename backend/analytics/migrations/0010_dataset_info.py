@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-15 22:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0009_dataset_checksum'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dataset',
+            name='dataset_info',
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
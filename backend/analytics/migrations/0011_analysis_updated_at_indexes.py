@@ -0,0 +1,22 @@
+# Generated by Django 5.2.3 on 2026-10-15 23:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0010_dataset_info'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='analysis',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+        migrations.AddIndex(
+            model_name='analysis',
+            index=models.Index(fields=['dataset', '-updated_at'], name='analysis_dataset_updated_idx'),
+        ),
+    ]
@@ -1,27 +1,56 @@
 from django.db import models
 from django.contrib.auth.models import User
+from django.contrib.postgres.search import SearchVectorField
+import os
+import time
 import uuid
 
+MB_PER_BYTE = 1 / (1024 * 1024)
+
+
+def uuid7():
+    """Time-ordered UUID (RFC 9562 version 7).
+
+    The leading 48 bits are the Unix time in milliseconds, so new primary keys
+    land at the right edge of the B-tree instead of on random leaf pages.
+    """
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10), 'big')
+    value = (value & ~(0xF << 76)) | (0x7 << 76)  # version 7
+    value = (value & ~(0x3 << 62)) | (0x2 << 62)  # RFC 4122 variant
+    return uuid.UUID(int=value)
+
 
 class Dataset(models.Model):
     """Model to store uploaded datasets"""
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     name = models.CharField(max_length=255)
     description = models.TextField(blank=True)
     file = models.FileField(upload_to='datasets/')
     uploaded_by = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True)
-    uploaded_at = models.DateTimeField(auto_now_add=True)
+    uploaded_at = models.DateTimeField(auto_now_add=True, db_index=True)
     file_size = models.BigIntegerField(null=True, blank=True)
+    file_size_mb = models.FloatField(null=True, blank=True)
     rows_count = models.IntegerField(null=True, blank=True)
     columns_count = models.IntegerField(null=True, blank=True)
     file_type = models.CharField(max_length=50, blank=True)
+    checksum = models.CharField(max_length=64, blank=True)  # SHA-256 of the uploaded file
+    dataset_info = models.JSONField(null=True, blank=True)  # get_dataset_info() captured at upload
+    # Maintained by a database trigger on PostgreSQL (name + description)
+    search_vector = SearchVectorField(null=True, editable=False)
 
     class Meta:
         ordering = ['-uploaded_at']
+        indexes = [
+            models.Index(fields=['uploaded_by', '-uploaded_at'], name='dataset_owner_uploaded_idx'),
+        ]
 
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        self.file_size_mb = round(self.file_size * MB_PER_BYTE, 2) if self.file_size else None
+        super().save(*args, **kwargs)
+
 
 class Analysis(models.Model):
     """Model to store analysis results"""
@@ -36,21 +65,31 @@ class Analysis(models.Model):
         ('quick_analysis', 'Quick AI Analysis'),
     ]
 
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     dataset = models.ForeignKey(Dataset, on_delete=models.CASCADE, related_name='analyses')
     analysis_type = models.CharField(max_length=50, choices=ANALYSIS_TYPES)
     title = models.CharField(max_length=255)
     description = models.TextField(blank=True)
     parameters = models.JSONField(default=dict)
     results = models.JSONField(default=dict)
-    created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+    # Maintained by a database trigger on PostgreSQL (title + description)
+    search_vector = SearchVectorField(null=True, editable=False)
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['dataset', '-created_at'], name='analysis_dataset_created_idx'),
+            models.Index(fields=['dataset', 'analysis_type', '-created_at'], name='analysis_ds_type_ct_idx'),
+            models.Index(fields=['dataset', '-updated_at'], name='analysis_dataset_updated_idx'),
+        ]
 
     def __str__(self):
-        return f"{self.title} - {self.dataset.name}"
+        # Only use the dataset name when it is already loaded, so str() never
+        # issues a query of its own
+        dataset = self.dataset.name if Analysis.dataset.is_cached(self) else self.dataset_id
+        return f"{self.title} - {dataset}"
 
 
 class Visualization(models.Model):
@@ -66,16 +105,19 @@ class Visualization(models.Model):
         ('violin', 'Violin Plot'),
     ]
 
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     analysis = models.ForeignKey(Analysis, on_delete=models.CASCADE, related_name='visualizations')
     chart_type = models.CharField(max_length=50, choices=CHART_TYPES)
     title = models.CharField(max_length=255)
     config = models.JSONField(default=dict)
     data = models.JSONField(default=dict)
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['analysis', '-created_at'], name='viz_analysis_created_idx'),
+        ]
 
     def __str__(self):
         return f"{self.title} ({self.chart_type})"
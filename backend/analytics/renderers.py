@@ -0,0 +1,45 @@
+import orjson
+import pyarrow as pa
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+
+class ORJSONRenderer(JSONRenderer):
+    """JSON renderer backed by orjson.
+
+    numpy arrays/scalars are serialized natively and NaN/inf become ``null``.
+    Anything orjson can't handle goes through DRF's encoder.
+    """
+    options = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        options = self.options
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            options |= orjson.OPT_INDENT_2
+
+        return orjson.dumps(data, default=self.encoder_class().default, option=options)
+
+
+class ArrowStreamRenderer(BaseRenderer):
+    """Arrow IPC stream renderer for tabular responses.
+
+    Views hand it a ``pyarrow.Table``; any other payload, such as an error,
+    is sent as a one-row table holding its JSON in an ``error`` column.
+    """
+    media_type = 'application/vnd.apache.arrow.stream'
+    format = 'arrow'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if not isinstance(data, pa.Table):
+            data = pa.table({'error': [orjson.dumps(data, default=str).decode()]})
+
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, data.schema) as writer:
+            writer.write_table(data)
+        return sink.getvalue().to_pybytes()
@@ -1,25 +1,63 @@
+import copy
+import uuid
+
 from rest_framework import serializers
 from .models import Dataset, Analysis, Visualization
 
+format_datetime = serializers.DateTimeField().to_representation
+
+RECENT_ANALYSES_LIMIT = 5
+
+
+class CachedFieldsMixin:
+    """Build the field map once per serializer class instead of per instance.
+
+    ``get_fields()`` deep-copies the declared fields and, for model serializers,
+    introspects the model on every instantiation. The unbound fields are cached
+    on the class and each instance gets shallow copies to bind.
+    """
 
-class DatasetSerializer(serializers.ModelSerializer):
-    file_size_mb = serializers.SerializerMethodField()
+    def get_fields(self):
+        cls = type(self)
+        cached = cls.__dict__.get('_cached_fields')
+        if cached is None:
+            cached = super().get_fields()
+            cls._cached_fields = cached
+        return {name: copy.copy(field) for name, field in cached.items()}
+
+
+class DatasetSerializer(CachedFieldsMixin, serializers.ModelSerializer):
+    recent_analyses = serializers.SerializerMethodField()
 
     class Meta:
         model = Dataset
         fields = [
             'id', 'name', 'description', 'file', 'uploaded_at',
-            'file_size', 'file_size_mb', 'rows_count', 'columns_count', 'file_type'
+            'file_size', 'file_size_mb', 'rows_count', 'columns_count', 'file_type',
+            'checksum', 'recent_analyses'
+        ]
+        read_only_fields = [
+            'id', 'uploaded_at', 'file_size', 'file_size_mb', 'rows_count', 'columns_count', 'file_type',
+            'checksum'
         ]
-        read_only_fields = ['id', 'uploaded_at', 'file_size', 'rows_count', 'columns_count', 'file_type']
 
-    def get_file_size_mb(self, obj):
-        if obj.file_size:
-            return round(obj.file_size / (1024 * 1024), 2)
-        return None
+    def get_recent_analyses(self, obj):
+        # Populated by DatasetViewSet's Prefetch; only query when it is missing
+        analyses = getattr(obj, 'recent_analyses', None)
+        if analyses is None:
+            analyses = obj.analyses.all()[:RECENT_ANALYSES_LIMIT]
+        return [
+            {
+                'id': str(analysis.id),
+                'title': analysis.title,
+                'analysis_type': analysis.analysis_type,
+                'created_at': format_datetime(analysis.created_at),
+            }
+            for analysis in analyses
+        ]
 
 
-class AnalysisSerializer(serializers.ModelSerializer):
+class AnalysisSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     dataset_name = serializers.CharField(source='dataset.name', read_only=True)
 
     class Meta:
@@ -30,8 +68,49 @@ class AnalysisSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
 
+    def to_representation(self, instance):
+        # Flat read path built by hand to skip the per-field dispatch; the
+        # declared fields are still used for validation on writes
+        return {
+            'id': str(instance.id),
+            'dataset': str(instance.dataset_id),
+            'dataset_name': instance.dataset.name,
+            'analysis_type': instance.analysis_type,
+            'title': instance.title,
+            'description': instance.description,
+            'parameters': instance.parameters,
+            'results': instance.results,
+            'created_at': format_datetime(instance.created_at),
+            'updated_at': format_datetime(instance.updated_at),
+        }
+
+
+class AnalysisListSerializer(CachedFieldsMixin, serializers.ModelSerializer):
+    """Analysis summary without the parameters/results payloads"""
+    dataset_name = serializers.CharField(source='dataset.name', read_only=True)
+
+    class Meta:
+        model = Analysis
+        fields = [
+            'id', 'dataset', 'dataset_name', 'analysis_type', 'title',
+            'description', 'created_at', 'updated_at'
+        ]
+        read_only_fields = fields
+
+    def to_representation(self, instance):
+        return {
+            'id': str(instance.id),
+            'dataset': str(instance.dataset_id),
+            'dataset_name': instance.dataset.name,
+            'analysis_type': instance.analysis_type,
+            'title': instance.title,
+            'description': instance.description,
+            'created_at': format_datetime(instance.created_at),
+            'updated_at': format_datetime(instance.updated_at),
+        }
+
 
-class VisualizationSerializer(serializers.ModelSerializer):
+class VisualizationSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     analysis_title = serializers.CharField(source='analysis.title', read_only=True)
 
     class Meta:
@@ -42,16 +121,95 @@ class VisualizationSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'created_at']
 
+    def to_representation(self, instance):
+        return {
+            'id': str(instance.id),
+            'analysis': str(instance.analysis_id),
+            'analysis_title': instance.analysis.title,
+            'chart_type': instance.chart_type,
+            'title': instance.title,
+            'config': instance.config,
+            'data': instance.data,
+            'created_at': format_datetime(instance.created_at),
+        }
+
+
+class VisualizationListSerializer(CachedFieldsMixin, serializers.ModelSerializer):
+    """Visualization summary without the config/figure payloads"""
+    analysis_title = serializers.CharField(source='analysis.title', read_only=True)
+
+    class Meta:
+        model = Visualization
+        fields = ['id', 'analysis', 'analysis_title', 'chart_type', 'title', 'created_at']
+        read_only_fields = fields
+
+    def to_representation(self, instance):
+        return {
+            'id': str(instance.id),
+            'analysis': str(instance.analysis_id),
+            'analysis_title': instance.analysis.title,
+            'chart_type': instance.chart_type,
+            'title': instance.title,
+            'created_at': format_datetime(instance.created_at),
+        }
+
 
-class DatasetUploadSerializer(serializers.Serializer):
+class DatasetUploadSerializer(CachedFieldsMixin, serializers.Serializer):
     file = serializers.FileField()
     name = serializers.CharField(max_length=255)
     description = serializers.CharField(required=False, allow_blank=True)
 
 
-class AnalysisRequestSerializer(serializers.Serializer):
+def _clean_text(value, max_length=None, allow_blank=False):
+    """CharField's trim/blank/length/null-char/surrogate checks; None when DRF would reject or coerce"""
+    if type(value) is not str:
+        return None
+    value = value.strip()
+    if (not value and not allow_blank) or (max_length is not None and len(value) > max_length) or '\x00' in value:
+        return None
+    if not value.isascii():
+        try:
+            value.encode('utf-8')
+        except UnicodeEncodeError:  # lone surrogates
+            return None
+    return value
+
+
+class AnalysisRequestSerializer(CachedFieldsMixin, serializers.Serializer):
     dataset_id = serializers.UUIDField()
     analysis_type = serializers.ChoiceField(choices=Analysis.ANALYSIS_TYPES)
     title = serializers.CharField(max_length=255)
     description = serializers.CharField(required=False, allow_blank=True)
     parameters = serializers.JSONField(default=dict)
+
+    ANALYSIS_TYPE_KEYS = frozenset(key for key, _ in Analysis.ANALYSIS_TYPES)
+
+    def to_internal_value(self, data):
+        # Well-formed JSON bodies are checked directly; anything else, including
+        # every invalid request, goes through DRF's field-by-field validation
+        # so errors keep their usual shape
+        validated = self._validate_json_body(data) if type(data) is dict else None
+        return validated if validated is not None else super().to_internal_value(data)
+
+    def _validate_json_body(self, data):
+        try:
+            dataset_id = uuid.UUID(data['dataset_id'])
+        except (KeyError, TypeError, ValueError, AttributeError):
+            return None
+        analysis_type = data.get('analysis_type')
+        if type(analysis_type) is not str or analysis_type not in self.ANALYSIS_TYPE_KEYS:
+            return None
+        title = _clean_text(data.get('title'), max_length=255)
+        if title is None:
+            return None
+        validated = {'dataset_id': dataset_id, 'analysis_type': analysis_type, 'title': title}
+        if 'description' in data:
+            description = _clean_text(data['description'], allow_blank=True)
+            if description is None:
+                return None
+            validated['description'] = description
+        parameters = data.get('parameters', {})
+        if type(parameters) is not dict:
+            return None
+        validated['parameters'] = parameters
+        return validated
@@ -2,28 +2,322 @@ import pandas as pd
 import numpy as np
 from sklearn.model_selection import train_test_split
 from sklearn.linear_model import LinearRegression, LogisticRegression
-from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
-from sklearn.cluster import KMeans
-from sklearn.preprocessing import StandardScaler, LabelEncoder
-from sklearn.metrics import accuracy_score, mean_squared_error, r2_score, classification_report
+from sklearn.ensemble import HistGradientBoostingClassifier, RandomForestClassifier, RandomForestRegressor
+from sklearn.inspection import permutation_importance
+from sklearn.cluster import KMeans, MiniBatchKMeans
+from sklearn.metrics import accuracy_score, confusion_matrix
 import plotly.express as px
 import plotly.graph_objects as go
 import plotly.figure_factory as ff
-import json
+import plotly.io as pio
+import pyarrow as pa
+import pyarrow.parquet as pq
+import orjson
 import os
+import re
+import sys
+import threading
+import warnings
+import weakref
+from collections import OrderedDict
 from io import StringIO
 
+# Formatting characters stripped before numeric conversion in _clean_dataset
+_CLEAN_RE = re.compile(r'[,$%]')
+_NULL_TOKENS = frozenset({'nan', 'null', 'N/A', 'n/a', 'NULL', ''})
+
+# Text columns are cleaned to Categorical when unique values / rows is below this
+CATEGORY_MAX_RATIO = 0.5
+CATEGORICAL_DTYPES = ['object', 'category']
+
+# CSVs larger than this are read and cleaned in chunks of CSV_CHUNK_ROWS rows
+CHUNKED_READ_THRESHOLD = 200 * 1024 * 1024
+CSV_CHUNK_ROWS = 200_000
+
+# Clustering switches to MiniBatchKMeans above this many rows
+MINIBATCH_KMEANS_THRESHOLD = 10_000
+
+# Regressions up to this size are fit with numpy's lstsq instead of LinearRegression
+LSTSQ_MAX_FEATURES = 50
+LSTSQ_MAX_ROWS = 100_000
+
+# Classification trains a random forest below this many training rows;
+# gradient boosting's 20-row minimum leaf size can't split smaller sets
+HIST_GRADIENT_BOOSTING_MIN_ROWS = 5_000
+
+# Permutation importance scores at most this many test rows per shuffle
+PERMUTATION_MAX_ROWS = 5_000
+
+# Ad-hoc charts are downsampled to about this many points before rendering
+MAX_PLOT_POINTS = 20_000
+
+# Known upload extensions; other files are identified by their leading bytes
+FILE_EXTENSION_TYPES = {'.csv': 'csv', '.xlsx': 'excel', '.xls': 'excel', '.json': 'json'}
+
+# Opt-in multi-threaded pyarrow CSV engine
+FAST_IO = os.environ.get('DATAAI_FAST_IO') == '1'
+
+# Cleaned frames are cached next to the upload as <file><suffix>
+PARQUET_SIDECAR_SUFFIX = '.parquet'
+
+# In-process LRU of parsed uploads keyed by (path, mtime, size). Bounded by entry
+# count and by one byte budget shared by all cached frames in the worker.
+DATAFRAME_CACHE_SIZE = 4
+DATAFRAME_CACHE_MAX_BYTES = int(os.environ.get('DATAFRAME_CACHE_MAX_MB', '128')) * 1024 * 1024
+_frame_cache = OrderedDict()  # key -> (frame, estimated bytes)
+_frame_cache_bytes = 0
+_frame_cache_lock = threading.Lock()
+
+# id(frame) -> (weakref, rows, null counts Series). Kept out of df.attrs: pandas
+# copies attrs onto derived frames and compares them with == in concat, which
+# raises for Series values.
+_null_counts_memo = {}
+
+
+def _orjson_default(obj):
+    if obj is pd.NA or obj is pd.NaT:
+        return None
+    if isinstance(obj, np.ndarray):  # object arrays, which OPT_SERIALIZE_NUMPY rejects
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if hasattr(obj, 'isoformat'):
+        return obj.isoformat()
+    raise TypeError
+
+
+def _fig_to_dict(fig):
+    """JSON-safe dict for a figure; orjson handles the numpy arrays and NaN -> null.
+
+    Dumps ``fig.to_dict()`` directly, skipping plotly's own JSON pipeline and
+    its recursive cleaning pass; anything orjson can't encode falls back to it.
+    """
+    try:
+        return orjson.loads(orjson.dumps(
+            fig.to_dict(), default=_orjson_default, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        ))
+    except TypeError:
+        return orjson.loads(pio.to_json(fig, validate=False, engine='orjson'))
+
+
+def _fit_least_squares(X, y):
+    """Ordinary least squares via lstsq, returning (intercept, coefficients).
+
+    Centers the data first like LinearRegression, so rank-deficient inputs get
+    the same minimum-norm coefficients.
+    """
+    X = np.asarray(X, dtype=float)
+    y = np.asarray(y, dtype=float)
+    X_mean = X.mean(axis=0)
+    y_mean = y.mean()
+    coefficients, *_ = np.linalg.lstsq(X - X_mean, y - y_mean, rcond=None)
+    return y_mean - X_mean @ coefficients, coefficients
+
+
+def _estimate_memory_usage(df, sample_size=1000):
+    """Approximate ``df.memory_usage(deep=True).sum()``.
+
+    Object columns are sized from the first ``sample_size`` values instead of
+    calling ``sys.getsizeof`` on every cell; small frames are measured exactly.
+    """
+    total = int(df.memory_usage(deep=False).sum())
+    for col in df.select_dtypes(include=['object']).columns:
+        sizes = df[col].head(sample_size).map(sys.getsizeof)
+        if len(sizes) == len(df):
+            total += int(sizes.sum())
+        elif len(sizes):
+            total += int(sizes.mean() * len(df))
+    return total
+
+
+def _forget_missing_counts(key, ref):
+    entry = _null_counts_memo.get(key)
+    if entry is not None and entry[0] is ref:
+        del _null_counts_memo[key]
+
+
+def _remember_missing_counts(df, counts):
+    """Memoize a frame's per-column null counts until the frame is garbage collected"""
+    key = id(df)
+    ref = weakref.ref(df, lambda ref, key=key: _forget_missing_counts(key, ref))
+    _null_counts_memo[key] = (ref, len(df), counts)
+
+
+def _lookup_missing_counts(df):
+    entry = _null_counts_memo.get(id(df))
+    if entry is None or entry[0]() is not df:
+        return None
+    ref, n_rows, counts = entry
+    # The same frame may have gained rows or columns since the counts were taken
+    if n_rows != len(df) or not counts.index.equals(df.columns):
+        return None
+    return counts
+
+
+def _missing_counts(df):
+    """Per-column null counts, memoized per frame object"""
+    counts = _lookup_missing_counts(df)
+    if counts is None:
+        counts = df.isna().sum()
+        _remember_missing_counts(df, counts)
+    return counts
+
+
+def _frame_cache_put(key, df):
+    """Add a frame to the LRU, evicting the oldest until the byte budget fits"""
+    global _frame_cache_bytes
+    nbytes = _estimate_memory_usage(df)
+    if nbytes > DATAFRAME_CACHE_MAX_BYTES:
+        return
+    with _frame_cache_lock:
+        previous = _frame_cache.pop(key, None)
+        if previous is not None:
+            _frame_cache_bytes -= previous[1]
+        _frame_cache[key] = (df, nbytes)
+        _frame_cache_bytes += nbytes
+        while len(_frame_cache) > DATAFRAME_CACHE_SIZE or _frame_cache_bytes > DATAFRAME_CACHE_MAX_BYTES:
+            _, (_, evicted_bytes) = _frame_cache.popitem(last=False)
+            _frame_cache_bytes -= evicted_bytes
+
+
+def _parquet_null_counts(path, columns):
+    """Per-column null counts from a Parquet footer's row-group statistics, or None if any are missing"""
+    metadata = pq.read_metadata(path)
+    counts = dict.fromkeys(columns, 0)
+    for i in range(metadata.num_row_groups):
+        row_group = metadata.row_group(i)
+        for j in range(row_group.num_columns):
+            chunk = row_group.column(j)
+            if chunk.path_in_schema not in counts:
+                continue  # stored index columns
+            stats = chunk.statistics
+            if stats is None or not stats.has_null_count:
+                return None
+            counts[chunk.path_in_schema] += stats.null_count
+    return pd.Series(list(counts.values()), index=columns, dtype=np.int64)
+
+
+def _regression_metrics(y_true, y_pred):
+    """R², MSE, RMSE and MAE from a single residual vector"""
+    y_true = np.asarray(y_true, dtype=float)
+    resid = y_true - np.asarray(y_pred, dtype=float)
+    ss_res = float(resid @ resid)
+    centered = y_true - y_true.mean()
+    ss_tot = float(centered @ centered)
+    if ss_tot == 0:
+        # Constant target: same convention as sklearn's r2_score
+        r2 = 1.0 if ss_res == 0 else 0.0
+    else:
+        r2 = 1 - ss_res / ss_tot
+    mse = ss_res / resid.size
+    return r2, mse, float(np.sqrt(mse)), float(np.abs(resid).mean())
+
+
+def _report_from_confusion(cm, labels):
+    """classification_report(output_dict=True) equivalent computed from a confusion matrix"""
+    cm = np.asarray(cm, dtype=np.int64)
+    tp = np.diag(cm).astype(float)
+    support = cm.sum(axis=1)
+    predicted = cm.sum(axis=0)
+    # Undefined ratios are reported as 0, matching sklearn's zero_division default
+    precision = np.divide(tp, predicted, out=np.zeros_like(tp), where=predicted > 0)
+    recall = np.divide(tp, support, out=np.zeros_like(tp), where=support > 0)
+    denom = support + predicted
+    f1 = np.divide(2 * tp, denom, out=np.zeros_like(tp), where=denom > 0)
+
+    report = {
+        str(label): {'precision': float(p), 'recall': float(r), 'f1-score': float(f), 'support': float(n)}
+        for label, p, r, f, n in zip(labels, precision.tolist(), recall.tolist(), f1.tolist(), support.tolist())
+    }
+    total = int(support.sum())
+    report['accuracy'] = float(tp.sum() / total) if total else 0.0
+    weights = support / total if total else np.zeros_like(tp)
+    report['macro avg'] = {
+        'precision': float(precision.mean()), 'recall': float(recall.mean()),
+        'f1-score': float(f1.mean()), 'support': float(total),
+    }
+    report['weighted avg'] = {
+        'precision': float(precision @ weights), 'recall': float(recall @ weights),
+        'f1-score': float(f1 @ weights), 'support': float(total),
+    }
+    return report
+
+
+def _lttb_indices(x, y, n_out):
+    """Row positions kept by Largest-Triangle-Three-Buckets downsampling of a line"""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    # Points between the fixed first and last split into n_out - 2 buckets
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    idx = np.empty(n_out, dtype=np.int64)
+    idx[0], idx[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        nlo, nhi = (hi, edges[i + 2]) if i + 2 < len(edges) else (n - 1, n)
+        avg_x, avg_y = x[nlo:nhi].mean(), y[nlo:nhi].mean()
+        # Keep the point forming the largest triangle with the last kept point
+        # and the next bucket's average
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(np.argmax(area))
+        idx[i + 1] = a
+    return idx
+
+
+def _downsample_line(df, x_col, y_col, n_out=MAX_PLOT_POINTS):
+    """Reduce a line chart's rows with LTTB, or evenly spaced rows for non-numeric axes"""
+    x, y = df[x_col], df[y_col]
+    if pd.api.types.is_datetime64_any_dtype(x):
+        x = x.astype('int64').where(x.notna())
+    if not (pd.api.types.is_numeric_dtype(x) and pd.api.types.is_numeric_dtype(y)):
+        return df.iloc[np.linspace(0, len(df) - 1, n_out).astype(np.int64)]
+    x = x.to_numpy(dtype=float, na_value=np.nan)
+    y = y.to_numpy(dtype=float, na_value=np.nan)
+    valid = np.flatnonzero(np.isfinite(x) & np.isfinite(y))
+    return df.iloc[valid[_lttb_indices(x[valid], y[valid], n_out)]]
+
+
+def _top_k_indices(values, k):
+    """Positions of the k largest values in descending order, ties kept in position order"""
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    if k >= n:
+        return np.argsort(-values, kind='stable')
+    # Partition to find the k-th largest, then stable-sort only the candidates
+    threshold = np.partition(values, n - k)[n - k]
+    candidates = np.flatnonzero(values >= threshold)
+    return candidates[np.argsort(-values[candidates], kind='stable')[:k]]
+
+
+def _scrub_array(a):
+    """Convert a float array to nested lists with NaN/inf replaced by None"""
+    return np.where(np.isfinite(a), a, None).tolist()
+
 
 class DataAnalysisService:
     """Service class for AI-powered data analysis"""
 
     @staticmethod
     def clean_for_json(data):
-        """Clean data structure to be JSON serializable by replacing NaN values"""
+        """Clean data structure to be JSON serializable by replacing NaN values.
+
+        Round-trips through orjson, which maps NaN/inf to null and numpy values
+        to Python ones in C; falls back to the recursive walk for anything it rejects.
+        """
+        try:
+            return orjson.loads(orjson.dumps(
+                data, default=_orjson_default, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+            ))
+        except TypeError:
+            return DataAnalysisService._clean_for_json_recursive(data)
+
+    @staticmethod
+    def _clean_for_json_recursive(data):
         if isinstance(data, dict):
-            return {key: DataAnalysisService.clean_for_json(value) for key, value in data.items()}
+            return {key: DataAnalysisService._clean_for_json_recursive(value) for key, value in data.items()}
         elif isinstance(data, list):
-            return [DataAnalysisService.clean_for_json(item) for item in data]
+            return [DataAnalysisService._clean_for_json_recursive(item) for item in data]
         elif isinstance(data, float):
             if np.isnan(data) or np.isinf(data):
                 return None
@@ -33,22 +327,43 @@ class DataAnalysisService:
         else:
             return data
 
+    @staticmethod
+    def detect_file_type(file_path):
+        """Dataset format from the file extension, sniffing the leading bytes only when it is missing or unknown"""
+        file_type = FILE_EXTENSION_TYPES.get(os.path.splitext(file_path)[1].lower())
+        if file_type is not None:
+            return file_type
+
+        with open(file_path, 'rb') as f:
+            header = f.read(8)
+
+        if header.startswith(b'PK\x03\x04'):  # xlsx is a zip container
+            return 'excel'
+        if header.startswith(b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'):  # legacy xls (OLE2)
+            return 'excel'
+        if header.lstrip(b'\xef\xbb\xbf \t\r\n')[:1] in (b'{', b'['):
+            return 'json'
+        return 'csv'
+
     @staticmethod
     def read_dataset(file_path, file_type=None):
         """Read dataset from various file formats with enhanced data cleaning"""
+        cached = DataAnalysisService._read_parquet_sidecar(file_path)
+        if cached is not None:
+            return cached
         try:
-            if file_type == 'csv' or file_path.endswith('.csv'):
-                df = pd.read_csv(file_path)
-            elif file_type == 'excel' or file_path.endswith(('.xlsx', '.xls')):
+            if file_type not in ('csv', 'excel', 'json'):
+                file_type = DataAnalysisService.detect_file_type(file_path)
+
+            if file_type == 'csv':
+                if os.path.getsize(file_path) > CHUNKED_READ_THRESHOLD:
+                    df = DataAnalysisService._read_csv_chunked(file_path)
+                else:
+                    df = DataAnalysisService._read_csv(file_path)
+            elif file_type == 'excel':
                 df = pd.read_excel(file_path)
-            elif file_type == 'json' or file_path.endswith('.json'):
-                df = pd.read_json(file_path)
             else:
-                # Try to auto-detect
-                try:
-                    df = pd.read_csv(file_path)
-                except:
-                    df = pd.read_excel(file_path)
+                df = pd.read_json(file_path)
 
             # Clean and preprocess the data
             df = DataAnalysisService._clean_dataset(df)
@@ -56,9 +371,177 @@ class DataAnalysisService:
         except Exception as e:
             raise ValueError(f"Error reading file: {str(e)}")
 
+    @staticmethod
+    def read_dataset_cached(file_path):
+        """read_dataset for stored uploads, served from the in-process LRU when the file is unchanged"""
+        stat = os.stat(file_path)
+        key = (file_path, stat.st_mtime_ns, stat.st_size)
+        with _frame_cache_lock:
+            entry = _frame_cache.get(key)
+            if entry is not None:
+                _frame_cache.move_to_end(key)
+        if entry is not None:
+            df = entry[0]
+        else:
+            df = DataAnalysisService.read_dataset(file_path)
+            _frame_cache_put(key, df)
+        # Shallow copy so callers adding or replacing columns leave the cached frame alone
+        frame = df.copy(deep=False)
+        counts = _lookup_missing_counts(df)
+        if counts is not None:
+            _remember_missing_counts(frame, counts)
+        return frame
+
+    @staticmethod
+    def write_parquet_sidecar(df, file_path):
+        """Store a cleaned frame next to its upload so later reads skip parsing and cleaning"""
+        sidecar = file_path + PARQUET_SIDECAR_SUFFIX
+        out = df.copy(deep=False)
+        out.attrs = {}  # memoized helpers in attrs are not JSON-serializable
+        try:
+            out.to_parquet(sidecar + '.tmp', compression='zstd')
+            os.replace(sidecar + '.tmp', sidecar)
+        except Exception:
+            # The sidecar is only a cache: columns Arrow can't store (mixed-type
+            # objects, complex numbers, ...) or a failed write must not fail the upload
+            if os.path.exists(sidecar + '.tmp'):
+                os.remove(sidecar + '.tmp')
+
+    @staticmethod
+    def delete_parquet_sidecar(file_path):
+        """Remove the upload's Parquet sidecar, if it has one"""
+        try:
+            os.remove(file_path + PARQUET_SIDECAR_SUFFIX)
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def _read_parquet_sidecar(file_path):
+        """Cleaned frame from the upload's Parquet sidecar, or None if there isn't a fresh one"""
+        sidecar = file_path + PARQUET_SIDECAR_SUFFIX
+        try:
+            if os.path.getmtime(sidecar) < os.path.getmtime(file_path):
+                return None
+            df = pd.read_parquet(sidecar)
+            # Seed the null-count memo from the footer so get_dataset_info and the
+            # quality checks don't rescan every column
+            null_counts = _parquet_null_counts(sidecar, df.columns)
+        except (ValueError, OSError):
+            return None
+        # Arrow hands missing strings back as None; keep pandas' NaN
+        object_cols = df.select_dtypes(include='object').columns
+        if len(object_cols):
+            df[object_cols] = df[object_cols].fillna(np.nan)
+        df.attrs['_cleaned'] = True
+        if null_counts is not None:
+            _remember_missing_counts(df, null_counts)
+        return df
+
+    @staticmethod
+    def read_sidecar_table(file_path, n_rows):
+        """First ``n_rows`` of the upload's fresh Parquet sidecar as an Arrow table (one batch read), or None"""
+        sidecar = file_path + PARQUET_SIDECAR_SUFFIX
+        try:
+            if os.path.getmtime(sidecar) < os.path.getmtime(file_path):
+                return None
+            parquet_file = pq.ParquetFile(sidecar)
+            batch = next(parquet_file.iter_batches(batch_size=n_rows), None)
+        except (ValueError, OSError):
+            return None
+        if batch is None:
+            return parquet_file.schema_arrow.empty_table()
+        return pa.Table.from_batches([batch])
+
+    @staticmethod
+    def read_sidecar_head(file_path, n_rows):
+        """First ``n_rows`` of the upload's fresh Parquet sidecar as a DataFrame, or None"""
+        table = DataAnalysisService.read_sidecar_table(file_path, n_rows)
+        if table is None:
+            return None
+        df = table.to_pandas()
+        object_cols = df.select_dtypes(include='object').columns
+        if len(object_cols):
+            df[object_cols] = df[object_cols].fillna(np.nan)
+        return df
+
+    @staticmethod
+    def _read_csv(file_path):
+        """Read a CSV, using the multi-threaded pyarrow parser when DATAAI_FAST_IO=1"""
+        if FAST_IO:
+            try:
+                # Only the parser changes; keep numpy dtypes so the object-column
+                # checks downstream behave the same
+                return pd.read_csv(file_path, engine='pyarrow')
+            except ValueError:
+                pass
+        # Infer each column's dtype over the whole file in one pass instead of
+        # per internal block, which can leave mixed int/str object columns
+        return pd.read_csv(file_path, engine='c', low_memory=False)
+
+    @staticmethod
+    def _read_csv_chunked(file_path, chunksize=CSV_CHUNK_ROWS):
+        """Read and clean a large CSV chunk by chunk to bound peak memory"""
+        chunks = []
+        parsed = {}  # column -> per-chunk numeric parse
+        counts = {}  # column -> [numeric values, non-null values]
+
+        for chunk in pd.read_csv(file_path, chunksize=chunksize):
+            for col in chunk.columns:
+                tally = counts.setdefault(col, [0, 0])
+                if chunk[col].dtype == 'object':
+                    numeric_series, non_null = DataAnalysisService._parse_numeric(chunk[col])
+                else:
+                    numeric_series = chunk[col]
+                    non_null = int(numeric_series.notna().sum())
+                parsed.setdefault(col, []).append(numeric_series)
+                tally[0] += int(numeric_series.notna().sum())
+                tally[1] += non_null
+            chunks.append(chunk)
+
+        df = pd.concat(chunks, ignore_index=True)
+        del chunks
+
+        # Same majority rule as _clean_dataset, decided over the whole column
+        for col in df.columns:
+            if df[col].dtype != 'object':
+                continue
+            numeric_count, non_null = counts[col]
+            if numeric_count > 0.5 * non_null:
+                df[col] = pd.concat(parsed[col], ignore_index=True)
+            else:
+                df[col] = DataAnalysisService._to_category(df[col])
+
+        df.attrs['_cleaned'] = True
+        return df
+
+    @staticmethod
+    def _parse_numeric(series):
+        """Parse an object column as numbers after stripping common formatting.
+
+        Returns the parsed series and the number of non-null values it was parsed from.
+        """
+        # Strip commas, dollar and percent signs in one regex pass, then whitespace
+        temp_series = series.astype(str).str.replace(_CLEAN_RE, '', regex=True).str.strip()
+
+        # Replace 'nan', 'null', 'N/A', etc. with NaN
+        temp_series = temp_series.mask(temp_series.isin(_NULL_TOKENS))
+
+        return pd.to_numeric(temp_series, errors='coerce'), int(temp_series.notna().sum())
+
+    @staticmethod
+    def _to_category(series):
+        """Store a low-cardinality text column as a pandas Categorical"""
+        if len(series) and series.nunique(dropna=True) / len(series) < CATEGORY_MAX_RATIO:
+            return series.astype('category')
+        return series
+
     @staticmethod
     def _clean_dataset(df):
         """Clean dataset by handling common formatting issues"""
+        # read_dataset already cleaned this frame; cleaning is idempotent so skip the copy
+        if df.attrs.get('_cleaned'):
+            return df
+
         df_cleaned = df.copy()
 
         for col in df_cleaned.columns:
@@ -68,52 +551,52 @@ class DataAnalysisService:
 
             # Try to convert object columns to numeric
             if df_cleaned[col].dtype == 'object':
-                # Handle common formatting issues
-                temp_series = df_cleaned[col].astype(str)
-
-                # Remove common non-numeric characters
-                temp_series = temp_series.str.replace(',', '', regex=False)  # Remove commas
-                temp_series = temp_series.str.replace('$', '', regex=False)  # Remove dollar signs
-                temp_series = temp_series.str.replace('%', '', regex=False)  # Remove percent signs
-                temp_series = temp_series.str.strip()  # Remove whitespace
-
-                # Replace 'nan', 'null', 'N/A', etc. with NaN
-                temp_series = temp_series.replace(['nan', 'null', 'N/A', 'n/a', 'NULL', ''], np.nan)
-
-                # Try to convert to numeric
-                numeric_series = pd.to_numeric(temp_series, errors='coerce')
+                numeric_series, non_null = DataAnalysisService._parse_numeric(df_cleaned[col])
 
                 # If more than 50% of non-null values are numeric, treat as numeric
-                if numeric_series.notna().sum() > 0.5 * temp_series.notna().sum():
+                if numeric_series.notna().sum() > 0.5 * non_null:
                     df_cleaned[col] = numeric_series
+                else:
+                    df_cleaned[col] = DataAnalysisService._to_category(df_cleaned[col])
 
+        df_cleaned.attrs['_cleaned'] = True
         return df_cleaned
 
     @staticmethod
-    def get_dataset_info(df):
+    def _dtype_index(df):
+        """(numeric, categorical, datetime) column indexes, computed once per request"""
+        return (
+            df.select_dtypes(include=[np.number]).columns,
+            df.select_dtypes(include=CATEGORICAL_DTYPES).columns,
+            df.select_dtypes(include=['datetime']).columns,
+        )
+
+    @staticmethod
+    def get_dataset_info(df, dtype_idx=None):
         """Get basic information about the dataset"""
+        numeric_cols, categorical_cols, _ = dtype_idx or DataAnalysisService._dtype_index(df)
         info = {
             'rows_count': len(df),
             'columns_count': len(df.columns),
             'columns': list(df.columns),
             'dtypes': {col: str(dtype) for col, dtype in df.dtypes.to_dict().items()},
-            'memory_usage': int(df.memory_usage(deep=True).sum()),
-            'missing_values': {col: int(count) for col, count in df.isnull().sum().to_dict().items()},
-            'numeric_columns': df.select_dtypes(include=[np.number]).columns.tolist(),
-            'categorical_columns': df.select_dtypes(include=['object']).columns.tolist()
+            'memory_usage': _estimate_memory_usage(df),
+            'missing_values': _missing_counts(df).to_dict(),
+            'numeric_columns': numeric_cols.tolist(),
+            'categorical_columns': categorical_cols.tolist()
         }
 
         # Clean for JSON serialization
         return DataAnalysisService.clean_for_json(info)
 
     @staticmethod
-    def descriptive_statistics(df, columns=None):
+    def descriptive_statistics(df, columns=None, include_box=False, include_visualizations=True):
         """Generate descriptive statistics with enhanced visualizations"""
         if columns:
             df = df[columns]
 
         numeric_df = df.select_dtypes(include=[np.number])
-        categorical_df = df.select_dtypes(include=['object'])
+        categorical_df = df.select_dtypes(include=CATEGORICAL_DTYPES)
 
         # Convert numeric stats to JSON-serializable format
         numeric_stats = {}
@@ -123,26 +606,45 @@ class DataAnalysisService:
 
         if not numeric_df.empty:
             desc_stats = numeric_df.describe()
-            for col in desc_stats.columns:
-                numeric_stats[col] = {
-                    stat: float(value) if not pd.isna(value) else None
-                    for stat, value in desc_stats[col].items()
-                }
+            stats_arr = desc_stats.to_numpy(dtype=float)
+            stats_arr = np.where(np.isnan(stats_arr), None, stats_arr)
+            stat_names = desc_stats.index.tolist()
+            numeric_stats = {
+                col: dict(zip(stat_names, stats_arr[:, i].tolist()))
+                for i, col in enumerate(desc_stats.columns)
+            }
+
+            # Bin count depends only on the number of complete rows, so count them once
+            if include_visualizations:
+                complete_rows = int(numeric_df.notna().all(axis=1).sum())
 
+            for col in (desc_stats.columns if include_visualizations else []):
                 # Create enhanced distribution histogram for each numeric column
                 try:
                     # Calculate statistics for the column
                     col_stats = numeric_stats[col]
 
-                    # Create histogram with enhanced styling
-                    fig = px.histogram(
-                        numeric_df,
-                        x=col,
-                        title=f'Distribution of {col}',
-                        marginal="box",  # Add box plot on top
-                        nbins=min(30, int(np.sqrt(len(numeric_df.dropna())))),
-                        color_discrete_sequence=['#3B82F6']  # Blue color
-                    )
+                    # Bin once with numpy and draw the bars directly instead of
+                    # letting plotly re-bin the column
+                    values = numeric_df[col].dropna().to_numpy()
+                    nbins = min(30, int(np.sqrt(complete_rows))) or 'auto'
+                    counts, edges = np.histogram(values, bins=nbins)
+                    fig = go.Figure(go.Bar(
+                        x=(edges[:-1] + edges[1:]) / 2,
+                        y=counts,
+                        width=np.diff(edges),
+                        marker_color='#3B82F6',  # Blue color
+                        name=col
+                    ))
+                    fig.update_layout(title=f'Distribution of {col}', bargap=0)
+
+                    # Optional box plot on top (re-scans the column)
+                    if include_box:
+                        fig.add_trace(go.Box(x=values, yaxis='y2', marker_color='#3B82F6', name=col))
+                        fig.update_layout(
+                            yaxis=dict(domain=[0, 0.8]),
+                            yaxis2=dict(domain=[0.82, 1], showticklabels=False)
+                        )
 
                     # Add mean line
                     if col_stats.get('mean'):
@@ -169,10 +671,11 @@ class DataAnalysisService:
                     fig.update_traces(
                         marker_line_width=1,
                         marker_line_color="white",
-                        opacity=0.8
+                        opacity=0.8,
+                        selector=dict(type='bar')
                     )
 
-                    distribution_charts[col] = json.loads(fig.to_json())
+                    distribution_charts[col] = _fig_to_dict(fig)
                 except Exception as e:
                     print(f"Error creating distribution chart for {col}: {e}")
 
@@ -180,25 +683,38 @@ class DataAnalysisService:
             'numeric_stats': numeric_stats,
             'distribution_charts': distribution_charts,
             'categorical_stats': {},
-            'missing_values': {col: int(count) for col, count in df.isnull().sum().to_dict().items()},
+            'missing_values': _missing_counts(df).to_dict(),
             'data_types': {col: str(dtype) for col, dtype in df.dtypes.to_dict().items()}
         }
 
         # Categorical statistics with visualizations
         categorical_charts = {}
         for col in categorical_df.columns:
-            mode_val = categorical_df[col].mode()
-            value_counts = categorical_df[col].value_counts().head(10)
+            # One hashing pass gives the unique count, the mode and the top 10
+            all_counts = categorical_df[col].value_counts()
+            all_counts = all_counts[all_counts > 0]  # drop unused categories
+            value_counts = all_counts.head(10)
+
+            # Like Series.mode(), break ties on the highest count by the smallest value
+            most_frequent = None
+            if len(all_counts):
+                top = all_counts.index[all_counts.to_numpy() == all_counts.iloc[0]]
+                try:
+                    most_frequent = str(top.sort_values()[0])
+                except TypeError:
+                    most_frequent = str(top[0])
 
             results['categorical_stats'][col] = {
-                'unique_count': int(categorical_df[col].nunique()),
-                'most_frequent': str(mode_val.iloc[0]) if not mode_val.empty else None,
-                'value_counts': {str(k): int(v) for k, v in value_counts.to_dict().items()}
+                'unique_count': len(all_counts),
+                'most_frequent': most_frequent,
+                'value_counts': dict(zip(
+                    value_counts.index.astype(str).tolist(), value_counts.to_numpy(dtype=np.int64).tolist()
+                ))
             }
 
             # Create bar chart for categorical variables
             try:
-                if len(value_counts) > 1:
+                if include_visualizations and len(value_counts) > 1:
                     fig = px.bar(
                         x=value_counts.index[:10],
                         y=value_counts.values[:10],
@@ -211,7 +727,7 @@ class DataAnalysisService:
                         xaxis_title=col,
                         yaxis_title='Count'
                     )
-                    categorical_charts[col] = json.loads(fig.to_json())
+                    categorical_charts[col] = _fig_to_dict(fig)
             except Exception as e:
                 print(f"Error creating categorical chart for {col}: {e}")
 
@@ -221,83 +737,85 @@ class DataAnalysisService:
         return DataAnalysisService.clean_for_json(results)
 
     @staticmethod
-    def correlation_analysis(df, method='pearson'):
-        """Perform correlation analysis"""
-        numeric_df = df.select_dtypes(include=[np.number])
+    def correlation_analysis(df, method='pearson', include_visualizations=True, corr_matrix=None):
+        """Perform correlation analysis, reusing ``corr_matrix`` if the caller already has one"""
+        if corr_matrix is not None:
+            correlation_matrix = corr_matrix
+        else:
+            numeric_df = df.select_dtypes(include=[np.number])
 
-        if numeric_df.empty:
-            return {'error': 'No numeric columns found for correlation analysis'}
-
-        correlation_matrix = numeric_df.corr(method=method)
-
-        # Create enhanced heatmap
-        fig = px.imshow(
-            correlation_matrix,
-            labels=dict(color="Correlation"),
-            x=correlation_matrix.columns,
-            y=correlation_matrix.columns,
-            color_continuous_scale='RdBu',
-            title=f'{method.capitalize()} Correlation Matrix',
-            aspect="auto",
-            text_auto=True
-        )
+            if numeric_df.empty:
+                return {'error': 'No numeric columns found for correlation analysis'}
+
+            correlation_matrix = numeric_df.corr(method=method)
+
+        visualization = None
+        if include_visualizations:
+            # Create enhanced heatmap
+            fig = px.imshow(
+                correlation_matrix,
+                labels=dict(color="Correlation"),
+                x=correlation_matrix.columns,
+                y=correlation_matrix.columns,
+                color_continuous_scale='RdBu',
+                title=f'{method.capitalize()} Correlation Matrix',
+                aspect="auto",
+                text_auto=True
+            )
 
-        # Enhanced layout
-        fig.update_layout(
-            height=600,
-            font=dict(family="Inter, sans-serif", size=12),
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-            margin=dict(l=80, r=30, t=100, b=80)
-        )
+            # Enhanced layout
+            fig.update_layout(
+                height=600,
+                font=dict(family="Inter, sans-serif", size=12),
+                plot_bgcolor='rgba(0,0,0,0)',
+                paper_bgcolor='rgba(0,0,0,0)',
+                margin=dict(l=80, r=30, t=100, b=80)
+            )
 
-        # Update color scale
-        fig.update_coloraxes(
-            colorbar_title="Correlation",
-            cmin=-1,
-            cmax=1
-        )
+            # Update color scale
+            fig.update_coloraxes(
+                colorbar_title="Correlation",
+                cmin=-1,
+                cmax=1
+            )
 
-        # Add annotations for better readability
-        fig.update_traces(
-            texttemplate="%{z:.2f}",
-            textfont_size=10
-        )
+            # Add annotations for better readability
+            fig.update_traces(
+                texttemplate="%{z:.2f}",
+                textfont_size=10
+            )
+            visualization = _fig_to_dict(fig)
 
         # Convert correlation matrix to JSON-serializable format
-        corr_dict = {}
-        for col in correlation_matrix.columns:
-            corr_dict[col] = {
-                other_col: float(correlation_matrix.loc[col, other_col]) if not pd.isna(correlation_matrix.loc[col, other_col]) else None
-                for other_col in correlation_matrix.columns
-            }
+        cols = correlation_matrix.columns.tolist()
+        corr_dict = {
+            col: dict(zip(cols, row))
+            for col, row in zip(cols, _scrub_array(correlation_matrix.to_numpy(dtype=float)))
+        }
 
-        result = {
+        # The matrix is scrubbed above and plotly's encoder already writes NaN
+        # as null, so the recursive clean_for_json walk is not needed here
+        return {
             'correlation_matrix': corr_dict,
-            'visualization': json.loads(fig.to_json()),
+            'visualization': visualization,
             'strong_correlations': DataAnalysisService._find_strong_correlations(correlation_matrix)
         }
 
-        # Clean for JSON serialization
-        return DataAnalysisService.clean_for_json(result)
-
     @staticmethod
     def _find_strong_correlations(corr_matrix, threshold=0.7):
         """Find strong correlations in the matrix"""
-        strong_corr = []
-        for i in range(len(corr_matrix.columns)):
-            for j in range(i+1, len(corr_matrix.columns)):
-                corr_value = abs(corr_matrix.iloc[i, j])
-                if corr_value >= threshold:
-                    strong_corr.append({
-                        'feature1': corr_matrix.columns[i],
-                        'feature2': corr_matrix.columns[j],
-                        'correlation': round(corr_matrix.iloc[i, j], 3)
-                    })
-        return strong_corr
+        cols = corr_matrix.columns.tolist()
+        arr = corr_matrix.to_numpy(dtype=float)
+        i, j = np.triu_indices(len(cols), 1)
+        values = arr[i, j]
+        mask = np.abs(values) >= threshold
+        return [
+            {'feature1': cols[a], 'feature2': cols[b], 'correlation': round(float(c), 3)}
+            for a, b, c in zip(i[mask].tolist(), j[mask].tolist(), values[mask].tolist())
+        ]
 
     @staticmethod
-    def linear_regression_analysis(df, target_column, feature_columns=None):
+    def linear_regression_analysis(df, target_column, feature_columns=None, include_visualizations=True):
         """Perform comprehensive linear regression analysis with enhanced validation and visualizations"""
         try:
             print(f"Starting regression analysis. Target: {target_column}, Features: {feature_columns}")
@@ -334,39 +852,45 @@ class DataAnalysisService:
             non_numeric_features = [col for col in feature_columns if not pd.api.types.is_numeric_dtype(df_clean[col])]
             if non_numeric_features:
                 print(f"Converting non-numeric features to numeric: {non_numeric_features}")
+                # df_clean may be the caller's frame when it was already cleaned
+                df_clean = df_clean.copy()
                 for col in non_numeric_features:
                     df_clean[col] = pd.to_numeric(df_clean[col], errors='coerce')
 
-            # Prepare data
-            X = df_clean[feature_columns].copy()
-            y = df_clean[target_column].copy()
+            # Prepare data (fillna/to_numpy below produce new objects, so no copies here)
+            X = df_clean[feature_columns]
+            y = df_clean[target_column]
 
             print(f"Initial data shapes - X: {X.shape}, y: {y.shape}")
-            print(f"Missing values - X: {X.isna().sum().sum()}, y: {y.isna().sum()}")
+            x_missing = int(X.isna().sum().sum())
+            y_missing = int(y.isna().sum())
+            print(f"Missing values - X: {x_missing}, y: {y_missing}")
 
             # Handle missing values
-            if X.isna().any().any() or y.isna().any():
+            if x_missing or y_missing:
                 print("Handling missing values...")
-                # For features, use median imputation
-                for col in X.columns:
-                    if X[col].isna().any():
-                        median_val = X[col].median()
-                        if pd.isna(median_val):
-                            median_val = 0  # Fallback if all values are NaN
-                        X[col] = X[col].fillna(median_val)
+                # For features, use median imputation (0 if a column is all NaN)
+                medians = X.median(numeric_only=True)
+                X = X.fillna(medians.where(medians.notna(), 0.0))
 
                 # For target, use median imputation
-                if y.isna().any():
+                if y_missing:
                     y_median = y.median()
                     if pd.isna(y_median):
                         y_median = 0
                     y = y.fillna(y_median)
 
+            # Work on contiguous numpy arrays from here on instead of re-converting
+            # DataFrames in every split/fit/predict/metric call
+            X = np.ascontiguousarray(X.to_numpy(dtype=np.float64))
+            y = y.to_numpy(dtype=np.float64)
+
             # Remove infinite values
             print("Removing infinite values...")
             mask = np.isfinite(X).all(axis=1) & np.isfinite(y)
-            X = X[mask]
-            y = y[mask]
+            if not mask.all():
+                X = X[mask]
+                y = y[mask]
 
             print(f"After cleaning - X: {X.shape}, y: {y.shape}")
 
@@ -386,180 +910,181 @@ class DataAnalysisService:
 
             print(f"Train/test split - Train: {len(X_train)}, Test: {len(X_test)}")
 
-            # Train model
-            model = LinearRegression()
-            model.fit(X_train, y_train)
+            # Train model; small problems skip sklearn's input validation and go
+            # straight to lstsq
+            if X_train.shape[1] <= LSTSQ_MAX_FEATURES and len(X_train) < LSTSQ_MAX_ROWS:
+                coef_intercept, coefficients = _fit_least_squares(X_train, y_train)
+            else:
+                model = LinearRegression().fit(X_train, y_train)
+                coef_intercept, coefficients = model.intercept_, model.coef_
 
             # Make predictions
-            y_pred_train = model.predict(X_train)
-            y_pred_test = model.predict(X_test)
+            y_pred_train = X_train @ coefficients + coef_intercept
+            y_pred_test = X_test @ coefficients + coef_intercept
 
             # Calculate comprehensive metrics
-            train_r2 = r2_score(y_train, y_pred_train)
-            test_r2 = r2_score(y_test, y_pred_test)
-            train_mse = mean_squared_error(y_train, y_pred_train)
-            test_mse = mean_squared_error(y_test, y_pred_test)
-            train_rmse = np.sqrt(train_mse)
-            test_rmse = np.sqrt(test_mse)
-            train_mae = np.mean(np.abs(y_train - y_pred_train))
-            test_mae = np.mean(np.abs(y_test - y_pred_test))
+            train_r2, train_mse, train_rmse, train_mae = _regression_metrics(y_train, y_pred_train)
+            test_r2, test_mse, test_rmse, test_mae = _regression_metrics(y_test, y_pred_test)
 
             print(f"Model performance - R2: {test_r2:.4f}, RMSE: {test_rmse:.4f}")
 
             # Feature importance (coefficients)
-            feature_importance = {col: float(coef) for col, coef in zip(feature_columns, model.coef_)}
-            intercept = float(model.intercept_)
+            feature_importance = {col: float(coef) for col, coef in zip(feature_columns, coefficients)}
+            intercept = float(coef_intercept)
 
             # Create enhanced visualizations
             visualizations = {}
 
-            try:
-                # 1. Actual vs Predicted scatter plot with enhanced styling
-                fig1 = go.Figure()
-
-                # Add scatter points
-                fig1.add_trace(go.Scatter(
-                    x=y_test.tolist(),
-                    y=y_pred_test.tolist(),
-                    mode='markers',
-                    name='Test Predictions',
-                    marker=dict(
-                        color='blue',
-                        opacity=0.7,
-                        size=8,
-                        line=dict(width=1, color='darkblue')
-                    ),
-                    hovertemplate='Actual: %{x:.2f}<br>Predicted: %{y:.2f}<extra></extra>'
-                ))
-
-                # Add perfect prediction line
-                min_val = min(float(y_test.min()), float(y_pred_test.min()))
-                max_val = max(float(y_test.max()), float(y_pred_test.max()))
-                fig1.add_trace(go.Scatter(
-                    x=[min_val, max_val],
-                    y=[min_val, max_val],
-                    mode='lines',
-                    name='Perfect Prediction',
-                    line=dict(dash='dash', color='red', width=2),
-                    hoverinfo='skip'
-                ))
-
-                fig1.update_layout(
-                    title=f'Actual vs Predicted Values (R² = {test_r2:.3f})',
-                    xaxis_title='Actual Values',
-                    yaxis_title='Predicted Values',
-                    height=500,
-                    showlegend=True,
-                    font=dict(family="Inter, sans-serif", size=12),
-                    plot_bgcolor='rgba(0,0,0,0)',
-                    paper_bgcolor='rgba(0,0,0,0)',
-                    margin=dict(l=60, r=30, t=80, b=60)
-                )
-
-                visualizations['scatter_plot'] = json.loads(fig1.to_json())
-
-                # 2. Feature importance bar chart with enhanced styling
-                features_sorted = sorted(feature_importance.items(), key=lambda x: abs(x[1]), reverse=True)
-
-                fig2 = go.Figure()
-                fig2.add_trace(go.Bar(
-                    x=[f[0] for f in features_sorted],
-                    y=[f[1] for f in features_sorted],
-                    marker_color=['#2E8B57' if x[1] > 0 else '#DC143C' for x in features_sorted],
-                    text=[f'{x[1]:.3f}' for x in features_sorted],
-                    textposition='outside',
-                    hovertemplate='Feature: %{x}<br>Coefficient: %{y:.4f}<extra></extra>'
-                ))
-
-                fig2.update_layout(
-                    title='Feature Importance (Regression Coefficients)',
-                    xaxis_title='Features',
-                    yaxis_title='Coefficient Value',
-                    height=500,
-                    showlegend=False,
-                    font=dict(family="Inter, sans-serif", size=12),
-                    plot_bgcolor='rgba(0,0,0,0)',
-                    paper_bgcolor='rgba(0,0,0,0)',
-                    margin=dict(l=60, r=30, t=80, b=80),
-                    xaxis=dict(tickangle=45)
-                )
-
-                visualizations['feature_importance'] = json.loads(fig2.to_json())
-
-                # 3. Residuals plot with enhanced analysis
-                residuals = y_test - y_pred_test
-
-                fig3 = go.Figure()
-                fig3.add_trace(go.Scatter(
-                    x=y_pred_test.tolist(),
-                    y=residuals.tolist(),
-                    mode='markers',
-                    marker=dict(
-                        color='blue',
-                        opacity=0.7,
-                        size=8,
-                        line=dict(width=1, color='darkblue')
-                    ),
-                    name='Residuals',
-                    hovertemplate='Predicted: %{x:.2f}<br>Residual: %{y:.2f}<extra></extra>'
-                ))
+            # Figures are optional for callers that only need the numbers
+            if include_visualizations:
+                try:
+                    # 1. Actual vs Predicted scatter plot with enhanced styling
+                    fig1 = go.Figure()
+
+                    # Add scatter points
+                    fig1.add_trace(go.Scatter(
+                        x=y_test,
+                        y=y_pred_test,
+                        mode='markers',
+                        name='Test Predictions',
+                        marker=dict(
+                            color='blue',
+                            opacity=0.7,
+                            size=8,
+                            line=dict(width=1, color='darkblue')
+                        ),
+                        hovertemplate='Actual: %{x:.2f}<br>Predicted: %{y:.2f}<extra></extra>'
+                    ))
+
+                    # Add perfect prediction line
+                    min_val = min(float(y_test.min()), float(y_pred_test.min()))
+                    max_val = max(float(y_test.max()), float(y_pred_test.max()))
+                    fig1.add_trace(go.Scatter(
+                        x=[min_val, max_val],
+                        y=[min_val, max_val],
+                        mode='lines',
+                        name='Perfect Prediction',
+                        line=dict(dash='dash', color='red', width=2),
+                        hoverinfo='skip'
+                    ))
+
+                    fig1.update_layout(
+                        title=f'Actual vs Predicted Values (R² = {test_r2:.3f})',
+                        xaxis_title='Actual Values',
+                        yaxis_title='Predicted Values',
+                        height=500,
+                        showlegend=True,
+                        font=dict(family="Inter, sans-serif", size=12),
+                        plot_bgcolor='rgba(0,0,0,0)',
+                        paper_bgcolor='rgba(0,0,0,0)',
+                        margin=dict(l=60, r=30, t=80, b=60)
+                    )
 
-                # Add horizontal line at y=0
-                fig3.add_hline(y=0, line_dash="dash", line_color="red", line_width=2)
-
-                fig3.update_layout(
-                    title='Residuals Plot (Prediction Errors)',
-                    xaxis_title='Predicted Values',
-                    yaxis_title='Residuals (Actual - Predicted)',
-                    height=500,
-                    showlegend=False,
-                    font=dict(family="Inter, sans-serif", size=12),
-                    plot_bgcolor='rgba(0,0,0,0)',
-                    paper_bgcolor='rgba(0,0,0,0)',
-                    margin=dict(l=60, r=30, t=80, b=60)
-                )
+                    visualizations['scatter_plot'] = _fig_to_dict(fig1)
+
+                    # 2. Feature importance bar chart with enhanced styling
+                    order = np.argsort(-np.abs(coefficients), kind='stable')
+                    coefs_sorted = coefficients[order]
+
+                    fig2 = go.Figure()
+                    fig2.add_trace(go.Bar(
+                        x=[feature_columns[i] for i in order],
+                        y=coefs_sorted,
+                        marker_color=np.where(coefs_sorted > 0, '#2E8B57', '#DC143C'),
+                        text=[f'{c:.3f}' for c in coefs_sorted.tolist()],
+                        textposition='outside',
+                        hovertemplate='Feature: %{x}<br>Coefficient: %{y:.4f}<extra></extra>'
+                    ))
+
+                    fig2.update_layout(
+                        title='Feature Importance (Regression Coefficients)',
+                        xaxis_title='Features',
+                        yaxis_title='Coefficient Value',
+                        height=500,
+                        showlegend=False,
+                        font=dict(family="Inter, sans-serif", size=12),
+                        plot_bgcolor='rgba(0,0,0,0)',
+                        paper_bgcolor='rgba(0,0,0,0)',
+                        margin=dict(l=60, r=30, t=80, b=80),
+                        xaxis=dict(tickangle=45)
+                    )
 
-                visualizations['residuals'] = json.loads(fig3.to_json())
-
-                # 4. Model performance comparison chart
-                metrics_names = ['R²', 'RMSE', 'MAE']
-                train_metrics = [train_r2, train_rmse, train_mae]
-                test_metrics = [test_r2, test_rmse, test_mae]
-
-                fig4 = go.Figure()
-                fig4.add_trace(go.Bar(
-                    name='Training',
-                    x=metrics_names,
-                    y=train_metrics,
-                    marker_color='lightblue',
-                    text=[f'{x:.3f}' for x in train_metrics],
-                    textposition='outside'
-                ))
-                fig4.add_trace(go.Bar(
-                    name='Testing',
-                    x=metrics_names,
-                    y=test_metrics,
-                    marker_color='darkblue',
-                    text=[f'{x:.3f}' for x in test_metrics],
-                    textposition='outside'
-                ))
+                    visualizations['feature_importance'] = _fig_to_dict(fig2)
+
+                    # 3. Residuals plot with enhanced analysis
+                    residuals = y_test - y_pred_test
+
+                    fig3 = go.Figure()
+                    fig3.add_trace(go.Scatter(
+                        x=y_pred_test,
+                        y=residuals,
+                        mode='markers',
+                        marker=dict(
+                            color='blue',
+                            opacity=0.7,
+                            size=8,
+                            line=dict(width=1, color='darkblue')
+                        ),
+                        name='Residuals',
+                        hovertemplate='Predicted: %{x:.2f}<br>Residual: %{y:.2f}<extra></extra>'
+                    ))
+
+                    # Add horizontal line at y=0
+                    fig3.add_hline(y=0, line_dash="dash", line_color="red", line_width=2)
+
+                    fig3.update_layout(
+                        title='Residuals Plot (Prediction Errors)',
+                        xaxis_title='Predicted Values',
+                        yaxis_title='Residuals (Actual - Predicted)',
+                        height=500,
+                        showlegend=False,
+                        font=dict(family="Inter, sans-serif", size=12),
+                        plot_bgcolor='rgba(0,0,0,0)',
+                        paper_bgcolor='rgba(0,0,0,0)',
+                        margin=dict(l=60, r=30, t=80, b=60)
+                    )
 
-                fig4.update_layout(
-                    title='Model Performance Metrics',
-                    xaxis_title='Metrics',
-                    yaxis_title='Value',
-                    height=400,
-                    barmode='group',
-                    font=dict(family="Inter, sans-serif", size=12),
-                    plot_bgcolor='rgba(0,0,0,0)',
-                    paper_bgcolor='rgba(0,0,0,0)',
-                    margin=dict(l=60, r=30, t=80, b=60)
-                )
+                    visualizations['residuals'] = _fig_to_dict(fig3)
+
+                    # 4. Model performance comparison chart
+                    metrics_names = ['R²', 'RMSE', 'MAE']
+                    train_metrics = [train_r2, train_rmse, train_mae]
+                    test_metrics = [test_r2, test_rmse, test_mae]
+
+                    fig4 = go.Figure()
+                    fig4.add_trace(go.Bar(
+                        name='Training',
+                        x=metrics_names,
+                        y=train_metrics,
+                        marker_color='lightblue',
+                        text=[f'{x:.3f}' for x in train_metrics],
+                        textposition='outside'
+                    ))
+                    fig4.add_trace(go.Bar(
+                        name='Testing',
+                        x=metrics_names,
+                        y=test_metrics,
+                        marker_color='darkblue',
+                        text=[f'{x:.3f}' for x in test_metrics],
+                        textposition='outside'
+                    ))
+
+                    fig4.update_layout(
+                        title='Model Performance Metrics',
+                        xaxis_title='Metrics',
+                        yaxis_title='Value',
+                        height=400,
+                        barmode='group',
+                        font=dict(family="Inter, sans-serif", size=12),
+                        plot_bgcolor='rgba(0,0,0,0)',
+                        paper_bgcolor='rgba(0,0,0,0)',
+                        margin=dict(l=60, r=30, t=80, b=60)
+                    )
 
-                visualizations['performance_metrics'] = json.loads(fig4.to_json())
+                    visualizations['performance_metrics'] = _fig_to_dict(fig4)
 
-            except Exception as viz_error:
-                print(f"Error creating visualizations: {viz_error}")
+                except Exception as viz_error:
+                    print(f"Error creating visualizations: {viz_error}")
 
             # Generate comprehensive interpretation
             interpretation = DataAnalysisService._interpret_regression_results(test_r2, feature_importance)
@@ -590,7 +1115,7 @@ class DataAnalysisService:
                     'testing_samples': int(len(X_test)),
                     'features_used': feature_columns,
                     'target_column': target_column,
-                    'missing_values_handled': int((X.isna().sum().sum() + y.isna().sum())),
+                    'missing_values_handled': x_missing + y_missing,
                     'data_split_ratio': f'{int((1-test_size)*100)}/{int(test_size*100)}'
                 },
                 'model_equation': DataAnalysisService._generate_regression_equation(intercept, feature_importance)
@@ -614,7 +1139,7 @@ class DataAnalysisService:
             return DataAnalysisService.clean_for_json(error_result)
 
     @staticmethod
-    def clustering_analysis(df, n_clusters=3, features=None):
+    def clustering_analysis(df, n_clusters=3, features=None, include_visualizations=True):
         """Perform K-means clustering analysis with enhanced data validation"""
         try:
             # Clean the dataframe first
@@ -645,12 +1170,19 @@ class DataAnalysisService:
             if len(X) < n_clusters:
                 return {'error': f'After cleaning, not enough valid data points for {n_clusters} clusters'}
 
-            # Standardize features
-            scaler = StandardScaler()
-            X_scaled = scaler.fit_transform(X)
+            # Standardize features (z-score; constant columns scale to 0 as with
+            # StandardScaler) straight into a contiguous float32 buffer for KMeans,
+            # without float64 temporaries for the centred and scaled copies
+            X_arr = X.to_numpy(dtype=np.float64)
+            mean = X_arr.mean(axis=0)
+            std = X_arr.std(axis=0)
+            std = np.where(std > np.finfo(np.float64).eps * np.maximum(np.abs(mean), 1.0), std, 1.0)
+            X_scaled = np.empty(X_arr.shape, dtype=np.float32)
+            np.subtract(X_arr, mean, out=X_scaled, casting='same_kind')
+            X_scaled /= std.astype(np.float32)
 
             # Perform clustering
-            kmeans = KMeans(n_clusters=n_clusters, random_state=42, n_init=10)
+            kmeans = DataAnalysisService._make_kmeans(n_clusters, len(X_scaled), n_init=10, algorithm='elkan')
             clusters = kmeans.fit_predict(X_scaled)
 
             # Add clusters to dataframe
@@ -671,85 +1203,82 @@ class DataAnalysisService:
             # Create visualizations
             visualizations = {}
 
-            # Main cluster visualization
-            if len(X.columns) >= 2:
-                # 2D scatter plot
-                fig1 = px.scatter(
-                    x=X.iloc[:, 0].tolist(),
-                    y=X.iloc[:, 1].tolist(),
-                    color=clusters.tolist(),
-                    title=f'K-Means Clustering (k={n_clusters})',
-                    labels={'x': X.columns[0], 'y': X.columns[1], 'color': 'Cluster'},
-                    color_continuous_scale='viridis'
-                )
-                # Add cluster centers
-                fig1.add_trace(go.Scatter(
-                    x=kmeans.cluster_centers_[:, 0],
-                    y=kmeans.cluster_centers_[:, 1],
-                    mode='markers',
-                    marker=dict(size=15, color='red', symbol='x'),
-                    name='Cluster Centers'
-                ))
-                visualizations['cluster_plot'] = json.loads(fig1.to_json())
-
-                # If we have 3+ dimensions, also create a 3D plot
-                if len(X.columns) >= 3:
-                    fig2 = px.scatter_3d(
-                        x=X.iloc[:, 0].tolist(),
-                        y=X.iloc[:, 1].tolist(),
-                        z=X.iloc[:, 2].tolist(),
-                        color=clusters.tolist(),
-                        title=f'3D K-Means Clustering (k={n_clusters})',
-                        labels={'x': X.columns[0], 'y': X.columns[1], 'z': X.columns[2], 'color': 'Cluster'}
+            # Figures (and the elbow-plot refits) are skipped when not wanted
+            if include_visualizations:
+                # Main cluster visualization
+                if len(X.columns) >= 2:
+                    # 2D scatter plot
+                    fig1 = px.scatter(
+                        x=X.iloc[:, 0].to_numpy(),
+                        y=X.iloc[:, 1].to_numpy(),
+                        color=clusters,
+                        title=f'K-Means Clustering (k={n_clusters})',
+                        labels={'x': X.columns[0], 'y': X.columns[1], 'color': 'Cluster'},
+                        color_continuous_scale='viridis'
                     )
-                    visualizations['cluster_plot_3d'] = json.loads(fig2.to_json())
-            else:
-                # 1D histogram
-                fig1 = px.histogram(
-                    x=clusters.tolist(),
-                    title=f'Cluster Distribution (k={n_clusters})',
-                    labels={'x': 'Cluster', 'y': 'Count'}
-                )
-                visualizations['cluster_distribution'] = json.loads(fig1.to_json())
-
-            # Cluster size distribution
-            cluster_counts = pd.Series(clusters).value_counts().sort_index()
-            fig3 = px.bar(
-                x=cluster_counts.index,
-                y=cluster_counts.values,
-                title='Cluster Sizes',
-                labels={'x': 'Cluster', 'y': 'Number of Points'}
-            )
-            visualizations['cluster_sizes'] = json.loads(fig3.to_json())
-
-            # Elbow plot (simplified)
-            inertias = []
-            k_range = range(1, min(11, n_clusters + 3))
-            for k in k_range:
-                if k <= len(X):
-                    kmeans_temp = KMeans(n_clusters=k, random_state=42)
-                    kmeans_temp.fit(X_scaled)
-                    inertias.append(kmeans_temp.inertia_)
-
-            if len(inertias) > 1:
-                fig4 = go.Figure()
-                fig4.add_trace(go.Scatter(
-                    x=list(k_range[:len(inertias)]),
-                    y=inertias,
-                    mode='lines+markers',
-                    name='Inertia'
-                ))
-                fig4.update_layout(
-                    title='Elbow Plot for Optimal K',
-                    xaxis_title='Number of Clusters (k)',
-                    yaxis_title='Inertia',
-                    height=400
+                    # Add cluster centers
+                    fig1.add_trace(go.Scatter(
+                        x=kmeans.cluster_centers_[:, 0],
+                        y=kmeans.cluster_centers_[:, 1],
+                        mode='markers',
+                        marker=dict(size=15, color='red', symbol='x'),
+                        name='Cluster Centers'
+                    ))
+                    visualizations['cluster_plot'] = _fig_to_dict(fig1)
+
+                    # If we have 3+ dimensions, also create a 3D plot
+                    if len(X.columns) >= 3:
+                        fig2 = px.scatter_3d(
+                            x=X.iloc[:, 0].to_numpy(),
+                            y=X.iloc[:, 1].to_numpy(),
+                            z=X.iloc[:, 2].to_numpy(),
+                            color=clusters,
+                            title=f'3D K-Means Clustering (k={n_clusters})',
+                            labels={'x': X.columns[0], 'y': X.columns[1], 'z': X.columns[2], 'color': 'Cluster'}
+                        )
+                        visualizations['cluster_plot_3d'] = _fig_to_dict(fig2)
+                else:
+                    # 1D histogram
+                    fig1 = px.histogram(
+                        x=clusters.tolist(),
+                        title=f'Cluster Distribution (k={n_clusters})',
+                        labels={'x': 'Cluster', 'y': 'Count'}
+                    )
+                    visualizations['cluster_distribution'] = _fig_to_dict(fig1)
+
+                # Cluster size distribution
+                cluster_counts = np.bincount(clusters, minlength=n_clusters)
+                fig3 = px.bar(
+                    x=np.arange(len(cluster_counts)),
+                    y=cluster_counts,
+                    title='Cluster Sizes',
+                    labels={'x': 'Cluster', 'y': 'Number of Points'}
                 )
-                visualizations['elbow_plot'] = json.loads(fig4.to_json())
+                visualizations['cluster_sizes'] = _fig_to_dict(fig3)
+
+                # Elbow plot (simplified)
+                k_range = range(1, min(11, n_clusters + 3))
+                inertias = DataAnalysisService._elbow_inertias(X_scaled, min(k_range[-1], len(X)))
+
+                if len(inertias) > 1:
+                    fig4 = go.Figure()
+                    fig4.add_trace(go.Scatter(
+                        x=list(k_range[:len(inertias)]),
+                        y=inertias,
+                        mode='lines+markers',
+                        name='Inertia'
+                    ))
+                    fig4.update_layout(
+                        title='Elbow Plot for Optimal K',
+                        xaxis_title='Number of Clusters (k)',
+                        yaxis_title='Inertia',
+                        height=400
+                    )
+                    visualizations['elbow_plot'] = _fig_to_dict(fig4)
 
             result = {
                 'clusters': clusters.tolist(),
-                'cluster_centers': [[float(val) for val in center] for center in kmeans.cluster_centers_],
+                'cluster_centers': kmeans.cluster_centers_.astype(float).tolist(),
                 'cluster_summary': cluster_summary_dict,
                 'inertia': float(kmeans.inertia_),
                 'visualizations': visualizations
@@ -762,6 +1291,45 @@ class DataAnalysisService:
             error_result = {'error': f'Error in clustering analysis: {str(e)}'}
             return DataAnalysisService.clean_for_json(error_result)
 
+    @staticmethod
+    def _make_kmeans(n_clusters, n_samples, **kwargs):
+        """Full-batch KMeans, or MiniBatchKMeans once the data is large"""
+        if n_samples > MINIBATCH_KMEANS_THRESHOLD:
+            return MiniBatchKMeans(
+                n_clusters=n_clusters, random_state=42, n_init=3, batch_size=min(4096, n_samples)
+            )
+        return KMeans(n_clusters=n_clusters, random_state=42, **kwargs)
+
+    @staticmethod
+    def _elbow_inertias(X, max_k):
+        """Inertia for k = 1..max_k, warm-starting each fit from the previous centers.
+
+        Each step keeps the previous centroids and adds one point drawn
+        k-means++ style (weighted by squared distance), so every fit starts
+        close to convergence and needs one short run instead of a fresh
+        initialisation. Large inputs use MiniBatchKMeans for each step.
+        """
+        rng = np.random.default_rng(42)
+        centers = X.mean(axis=0, keepdims=True)
+        dist = ((X - centers) ** 2).sum(axis=1)
+        inertias = [float(dist.sum())]
+        for k in range(2, max_k + 1):
+            weights = dist.astype(np.float64)
+            total = weights.sum()
+            new_center = rng.choice(len(X), p=weights / total) if total > 0 else 0
+            init = np.vstack([centers, X[new_center]])
+            if len(X) > MINIBATCH_KMEANS_THRESHOLD:
+                kmeans = MiniBatchKMeans(
+                    n_clusters=k, init=init, n_init=1, max_iter=100, batch_size=min(4096, len(X)),
+                    reassignment_ratio=0.01, random_state=42
+                ).fit(X)
+            else:
+                kmeans = KMeans(n_clusters=k, init=init, n_init=1, max_iter=30, algorithm='elkan').fit(X)
+            centers = kmeans.cluster_centers_
+            dist = ((X - centers[kmeans.labels_]) ** 2).sum(axis=1)
+            inertias.append(float(kmeans.inertia_))
+        return inertias
+
     @staticmethod
     def classification_analysis(df, target_column, feature_columns=None):
         """Perform classification analysis with enhanced data validation"""
@@ -783,30 +1351,36 @@ class DataAnalysisService:
             X = df_clean[feature_columns].copy()
             y = df_clean[target_column].copy()
 
-            # Encode categorical variables
-            le_dict = {}
-            for col in X.select_dtypes(include=['object']).columns:
-                le = LabelEncoder()
-                X[col] = le.fit_transform(X[col].astype(str))
-                le_dict[col] = le
+            # Encode categorical variables; sorted categorical codes match
+            # LabelEncoder's but come from a hash table instead of searchsorted
+            for col in X.select_dtypes(include=CATEGORICAL_DTYPES).columns:
+                X[col] = X[col].astype(str).astype('category').cat.codes.astype(np.int64)
 
             # Encode target if categorical
-            target_le = None
-            if y.dtype == 'object':
-                target_le = LabelEncoder()
-                y = target_le.fit_transform(y.astype(str))
-
-            # Fill missing values with appropriate strategies
-            for col in X.columns:
-                if X[col].dtype in ['int64', 'float64']:
-                    X[col] = X[col].fillna(X[col].median())
-                else:
-                    X[col] = X[col].fillna(X[col].mode().iloc[0] if not X[col].mode().empty else 0)
+            if y.dtype == 'object' or isinstance(y.dtype, pd.CategoricalDtype):
+                y, _ = pd.factorize(y.astype(str), sort=True)
+                y = y.astype(np.int32)
+
+            # Fill missing values with appropriate strategies: median for
+            # int64/float64 columns, mode (or 0 when there is none) for the rest
+            num_cols = X.select_dtypes(include=['int64', 'float64']).columns
+            other_cols = X.columns.difference(num_cols, sort=False)
+            if X.isna().to_numpy().any():
+                fill_values = X[num_cols].median()
+                if len(other_cols):
+                    fill_values = pd.concat([fill_values, X[other_cols].mode().iloc[0].fillna(0)])
+                X = X.fillna(fill_values)
+
+            # The forest works on float32 anyway; convert once so sklearn gets a
+            # ready contiguous array
+            X = np.ascontiguousarray(X.to_numpy(dtype=np.float32))
+            y = np.asarray(y)
 
             # Remove rows with infinite values
             mask = np.isfinite(X).all(axis=1) & np.isfinite(y)
-            X = X[mask]
-            y = y[mask]
+            if not mask.all():
+                X = X[mask]
+                y = y[mask]
 
             if len(X) < 10:
                 return {'error': 'Not enough valid data points for classification analysis (need at least 10)'}
@@ -818,26 +1392,39 @@ class DataAnalysisService:
             # Split data
             X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
 
-            # Train model
-            model = RandomForestClassifier(n_estimators=100, random_state=42)
-            model.fit(X_train, y_train)
+            # Train model; on larger sets histogram gradient boosting bins features to
+            # uint8 and is much faster and smaller than a 100-tree random forest
+            if len(X_train) < HIST_GRADIENT_BOOSTING_MIN_ROWS:
+                model = RandomForestClassifier(n_estimators=100, random_state=42)
+                model.fit(X_train, y_train)
+                importances = model.feature_importances_
+            else:
+                model = HistGradientBoostingClassifier(random_state=42)
+                model.fit(X_train, y_train)
+                # Feature importance from permutation on the test set, clipped and
+                # normalised to sum to 1 like the forest's impurity importances
+                importances = permutation_importance(
+                    model, X_test, y_test, n_repeats=3, random_state=42,
+                    max_samples=min(len(X_test), PERMUTATION_MAX_ROWS)
+                ).importances_mean.clip(min=0)
+                if importances.sum() > 0:
+                    importances = importances / importances.sum()
 
             # Predictions
             y_pred = model.predict(X_test)
             accuracy = accuracy_score(y_test, y_pred)
 
-            # Feature importance - convert to JSON serializable
-            feature_importance = {col: float(importance) for col, importance in zip(feature_columns, model.feature_importances_)}
+            feature_importance = {col: float(importance) for col, importance in zip(feature_columns, importances)}
 
             # Create visualizations
             visualizations = {}
 
             # Feature importance bar chart
-            features_sorted = sorted(feature_importance.items(), key=lambda x: x[1], reverse=True)
+            top = _top_k_indices(importances, 10)  # Top 10 features
             fig1 = go.Figure(data=[
                 go.Bar(
-                    x=[f[0] for f in features_sorted[:10]],  # Top 10 features
-                    y=[f[1] for f in features_sorted[:10]],
+                    x=[feature_columns[i] for i in top],
+                    y=importances[top],
                     marker_color='blue'
                 )
             ])
@@ -847,14 +1434,11 @@ class DataAnalysisService:
                 yaxis_title='Importance',
                 height=400
             )
-            visualizations['feature_importance'] = json.loads(fig1.to_json())
+            visualizations['feature_importance'] = _fig_to_dict(fig1)
 
-            # Confusion matrix (simplified)
-            from sklearn.metrics import confusion_matrix
-            cm = confusion_matrix(y_test, y_pred)
-
-            # Get unique classes
-            unique_classes = sorted(list(set(y_test) | set(y_pred)))
+            # Confusion matrix over the sorted union of actual and predicted classes
+            unique_classes = np.union1d(y_test, y_pred)
+            cm = confusion_matrix(y_test, y_pred, labels=unique_classes)
 
             fig2 = px.imshow(
                 cm,
@@ -864,22 +1448,28 @@ class DataAnalysisService:
                 title="Confusion Matrix",
                 color_continuous_scale='Blues'
             )
-            visualizations['confusion_matrix'] = json.loads(fig2.to_json())
+            visualizations['confusion_matrix'] = _fig_to_dict(fig2)
 
             # Class distribution
-            unique, counts = np.unique(y_test, return_counts=True)
+            if np.issubdtype(y_test.dtype, np.integer) and y_test.min() >= 0:
+                # Dense integer codes (e.g. from factorize): count without sorting
+                counts = np.bincount(y_test)
+                unique = np.flatnonzero(counts)
+                counts = counts[unique]
+            else:
+                unique, counts = np.unique(y_test, return_counts=True)
             fig3 = px.bar(
                 x=[f"Class {u}" for u in unique],
                 y=counts,
                 title='Test Set Class Distribution',
                 labels={'x': 'Class', 'y': 'Count'}
             )
-            visualizations['class_distribution'] = json.loads(fig3.to_json())
+            visualizations['class_distribution'] = _fig_to_dict(fig3)
 
             result = {
                 'accuracy': round(float(accuracy), 4),
                 'feature_importance': feature_importance,
-                'classification_report': classification_report(y_test, y_pred, output_dict=True),
+                'classification_report': _report_from_confusion(cm, unique_classes),
                 'visualizations': visualizations,
                 'interpretation': f'Model achieved {accuracy:.2%} accuracy on test data'
             }
@@ -906,8 +1496,9 @@ class DataAnalysisService:
             interpretation.append("Poor model performance. Review features and data quality.")
 
         # Top features
-        top_features = sorted(feature_importance.items(), key=lambda x: abs(x[1]), reverse=True)[:3]
-        interpretation.append(f"Most important features: {', '.join([f[0] for f in top_features])}")
+        names = list(feature_importance)
+        top = _top_k_indices(np.abs(np.fromiter(feature_importance.values(), dtype=float, count=len(names))), 3)
+        interpretation.append(f"Most important features: {', '.join(names[i] for i in top)}")
 
         return ' '.join(interpretation)
 
@@ -915,21 +1506,40 @@ class DataAnalysisService:
     def create_visualization(df, chart_type, config):
         """Create various types of visualizations"""
         try:
+            # Large frames are downsampled so the figure JSON stays browser-sized
+            large = len(df) > MAX_PLOT_POINTS
+
             if chart_type == 'histogram':
                 column = config.get('column')
-                fig = px.histogram(df, x=column, title=f'Distribution of {column}')
+                if large and column in df.columns and pd.api.types.is_numeric_dtype(df[column]):
+                    # Bin server-side and send only the bar heights
+                    values = df[column].dropna().to_numpy()
+                    counts, edges = np.histogram(values, bins=min(100, int(np.sqrt(len(values)))) or 'auto')
+                    fig = go.Figure(go.Bar(x=(edges[:-1] + edges[1:]) / 2, y=counts, width=np.diff(edges)))
+                    fig.update_layout(title=f'Distribution of {column}', xaxis_title=column,
+                                      yaxis_title='count', bargap=0)
+                elif large and column in df.columns:
+                    counts = df[column].value_counts(sort=False)
+                    fig = go.Figure(go.Bar(x=counts.index.astype(str), y=counts.to_numpy()))
+                    fig.update_layout(title=f'Distribution of {column}', xaxis_title=column, yaxis_title='count')
+                else:
+                    fig = px.histogram(df, x=column, title=f'Distribution of {column}')
 
             elif chart_type == 'scatter':
                 x_col = config.get('x_column')
                 y_col = config.get('y_column')
                 color_col = config.get('color_column')
-                fig = px.scatter(df, x=x_col, y=y_col, color=color_col,
+                plot_df = df.sample(MAX_PLOT_POINTS, random_state=0) if large else df
+                fig = px.scatter(plot_df, x=x_col, y=y_col, color=color_col,
                                title=f'{x_col} vs {y_col}')
 
             elif chart_type == 'line':
                 x_col = config.get('x_column')
                 y_col = config.get('y_column')
-                fig = px.line(df, x=x_col, y=y_col, title=f'{y_col} over {x_col}')
+                plot_df = df
+                if large and x_col in df.columns and y_col in df.columns:
+                    plot_df = _downsample_line(df, x_col, y_col)
+                fig = px.line(plot_df, x=x_col, y=y_col, title=f'{y_col} over {x_col}')
 
             elif chart_type == 'bar':
                 x_col = config.get('x_column')
@@ -938,7 +1548,8 @@ class DataAnalysisService:
 
             elif chart_type == 'box':
                 column = config.get('column')
-                fig = px.box(df, y=column, title=f'Box Plot of {column}')
+                plot_df = df.sample(MAX_PLOT_POINTS, random_state=0) if large else df
+                fig = px.box(plot_df, y=column, title=f'Box Plot of {column}')
 
             elif chart_type == 'heatmap':
                 numeric_df = df.select_dtypes(include=[np.number])
@@ -948,7 +1559,7 @@ class DataAnalysisService:
             else:
                 return {'error': f'Unsupported chart type: {chart_type}'}
 
-            result = {'visualization': json.loads(fig.to_json())}
+            result = {'visualization': _fig_to_dict(fig)}
             return DataAnalysisService.clean_for_json(result)
 
         except Exception as e:
@@ -956,11 +1567,11 @@ class DataAnalysisService:
             return DataAnalysisService.clean_for_json(error_result)
 
     @staticmethod
-    def _analyze_data_quality(df):
+    def _analyze_data_quality(df, dtype_idx=None):
         """Analyze data quality and provide insights"""
         try:
             total_cells = df.shape[0] * df.shape[1]
-            missing_cells = df.isnull().sum().sum()
+            missing_cells = _missing_counts(df).sum()
             duplicate_rows = df.duplicated().sum()
 
             # Calculate data quality score
@@ -969,9 +1580,10 @@ class DataAnalysisService:
             quality_score = max(0, 100 - (missing_ratio * 50) - (duplicate_ratio * 30))
 
             # Analyze data types
-            numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
-            categorical_cols = df.select_dtypes(include=['object']).columns.tolist()
-            datetime_cols = df.select_dtypes(include=['datetime']).columns.tolist()
+            numeric_idx, categorical_idx, datetime_idx = dtype_idx or DataAnalysisService._dtype_index(df)
+            numeric_cols = numeric_idx.tolist()
+            categorical_cols = categorical_idx.tolist()
+            datetime_cols = datetime_idx.tolist()
 
             # Identify potential issues
             issues = []
@@ -982,14 +1594,16 @@ class DataAnalysisService:
 
             # Check for potential outliers in numeric columns
             outlier_columns = []
-            for col in numeric_cols:
-                Q1 = df[col].quantile(0.25)
-                Q3 = df[col].quantile(0.75)
+            if numeric_cols:
+                # Materialize the numeric block once and take the quartiles from it
+                values = df[numeric_cols].to_numpy(dtype=np.float64)
+                with warnings.catch_warnings():
+                    warnings.simplefilter('ignore', RuntimeWarning)  # all-NaN columns
+                    Q1, Q3 = np.nanquantile(values, [0.25, 0.75], axis=0)
                 IQR = Q3 - Q1
-                if IQR > 0:
-                    outliers = df[(df[col] < Q1 - 1.5*IQR) | (df[col] > Q3 + 1.5*IQR)][col].count()
-                    if outliers > len(df) * 0.05:  # More than 5% outliers
-                        outlier_columns.append(col)
+                outliers = ((values < Q1 - 1.5*IQR) | (values > Q3 + 1.5*IQR)).sum(axis=0)
+                flagged = (IQR > 0) & (outliers > len(df) * 0.05)  # More than 5% outliers
+                outlier_columns = [col for col, flag in zip(numeric_cols, flagged) if flag]
 
             if outlier_columns:
                 issues.append(f"Potential outliers in: {', '.join(outlier_columns[:3])}")
@@ -1038,12 +1652,11 @@ class DataAnalysisService:
         return recommendations
 
     @staticmethod
-    def _generate_ai_insights(df):
+    def _generate_ai_insights(df, dtype_idx=None, corr_matrix=None):
         """Generate AI-powered insights about the dataset"""
         try:
             insights = []
-            numeric_cols = df.select_dtypes(include=[np.number]).columns
-            categorical_cols = df.select_dtypes(include=['object']).columns
+            numeric_cols, categorical_cols, _ = dtype_idx or DataAnalysisService._dtype_index(df)
 
             # Dataset size insights
             if len(df) > 10000:
@@ -1065,13 +1678,13 @@ class DataAnalysisService:
             if len(numeric_cols) > 0:
                 # Check for highly correlated features
                 if len(numeric_cols) > 1:
-                    corr_matrix = df[numeric_cols].corr()
-                    high_corr_pairs = []
-                    for i in range(len(corr_matrix.columns)):
-                        for j in range(i+1, len(corr_matrix.columns)):
-                            corr_val = abs(corr_matrix.iloc[i, j])
-                            if corr_val > 0.8:
-                                high_corr_pairs.append((corr_matrix.columns[i], corr_matrix.columns[j], corr_val))
+                    if corr_matrix is None:
+                        corr_matrix = df[numeric_cols].corr()
+                    corr_values = corr_matrix.to_numpy()
+                    iu, ju = np.triu_indices_from(corr_values, k=1)
+                    abs_corr = np.abs(corr_values[iu, ju])
+                    hits = np.flatnonzero(abs_corr > 0.8)
+                    high_corr_pairs = list(zip(numeric_cols[iu[hits]], numeric_cols[ju[hits]], abs_corr[hits]))
 
                     if high_corr_pairs:
                         insights.append({
@@ -1082,11 +1695,8 @@ class DataAnalysisService:
                         })
 
                 # Check for skewed distributions
-                skewed_cols = []
-                for col in numeric_cols:
-                    skewness = df[col].skew()
-                    if abs(skewness) > 2:
-                        skewed_cols.append(col)
+                skewness = df[numeric_cols].skew().to_numpy()
+                skewed_cols = numeric_cols[np.abs(skewness) > 2].tolist()
 
                 if skewed_cols:
                     insights.append({
@@ -1140,12 +1750,11 @@ class DataAnalysisService:
             }]
 
     @staticmethod
-    def _get_visualization_recommendations(df):
+    def _get_visualization_recommendations(df, dtype_idx=None):
         """Recommend appropriate visualizations based on data characteristics"""
         try:
             recommendations = []
-            numeric_cols = df.select_dtypes(include=[np.number]).columns
-            categorical_cols = df.select_dtypes(include=['object']).columns
+            numeric_cols, categorical_cols, _ = dtype_idx or DataAnalysisService._dtype_index(df)
 
             # Distribution plots for numeric data
             for col in numeric_cols[:5]:  # Limit to first 5 columns
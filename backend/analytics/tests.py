@@ -0,0 +1,63 @@
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+from django.test import SimpleTestCase
+from sklearn.datasets import load_iris
+
+from .services import DataAnalysisService
+
+
+class ClassificationAnalysisTests(SimpleTestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def write_csv(self, df, name='data.csv'):
+        path = os.path.join(self.tmpdir.name, name)
+        df.to_csv(path, index=False)
+        return path
+
+    def test_sidecar_frame_with_missing_values(self):
+        rng = np.random.default_rng(0)
+        n_rows = 200
+        df = pd.DataFrame({
+            'a': rng.normal(size=n_rows),
+            'b': rng.normal(size=n_rows),
+            'flag': rng.integers(0, 2, n_rows).astype(bool),
+            't': rng.choice(['x', 'y', 'z'], n_rows),
+        })
+        df.loc[::7, 'a'] = np.nan
+        path = self.write_csv(df)
+        DataAnalysisService.write_parquet_sidecar(DataAnalysisService.read_dataset(path), path)
+
+        loaded = DataAnalysisService.read_dataset_cached(path)
+        result = DataAnalysisService.classification_analysis(loaded, 't')
+
+        self.assertNotIn('error', result)
+        self.assertIn('accuracy', result)
+
+    def test_small_dataset_learns(self):
+        iris = load_iris(as_frame=True).frame
+        df = iris.iloc[::5].reset_index(drop=True)  # 30 rows, 10 per class
+        df['target'] = df['target'].astype(str)
+
+        result = DataAnalysisService.classification_analysis(df, 'target')
+
+        self.assertNotIn('error', result)
+        self.assertGreaterEqual(result['accuracy'], 0.8)
+        self.assertGreater(sum(result['feature_importance'].values()), 0)
+
+
+class ParquetSidecarTests(SimpleTestCase):
+
+    def test_unstorable_column_is_skipped(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'data.csv')
+            df = pd.DataFrame({'z': [1 + 2j, 3 + 4j]})  # Arrow has no complex type
+
+            DataAnalysisService.write_parquet_sidecar(df, path)
+
+            self.assertEqual(os.listdir(tmpdir), [])
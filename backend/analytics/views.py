@@ -3,28 +3,138 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.settings import api_settings
 from django.core.files.storage import default_storage
-from django.core.files.base import ContentFile
+from django.core.cache import cache
+from django.contrib.postgres.search import SearchQuery
+from django.db import connection
+from django.db.models import Prefetch, Q
+import hashlib
 import os
 import uuid
 
+import orjson
+import pyarrow as pa
+
+from .cache import (
+    LIST_CACHE_ENABLED, LIST_CACHE_TIMEOUT, PREVIEW_CACHE_TIMEOUT, bump_list_version, list_cache_key, preview_cache_key
+)
 from .models import Dataset, Analysis, Visualization
 from .serializers import (
     DatasetSerializer, AnalysisSerializer, VisualizationSerializer,
-    DatasetUploadSerializer, AnalysisRequestSerializer
+    AnalysisListSerializer, VisualizationListSerializer,
+    DatasetUploadSerializer, AnalysisRequestSerializer, RECENT_ANALYSES_LIMIT
 )
+from .renderers import ArrowStreamRenderer
 from .services import DataAnalysisService
 
-
-class DatasetViewSet(viewsets.ModelViewSet):
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1 MiB
+PREVIEW_ROWS = 10
+# Preview can also be fetched as an Arrow IPC stream (Accept header or ?format=arrow)
+PREVIEW_RENDERERS = [*api_settings.DEFAULT_RENDERER_CLASSES, ArrowStreamRenderer]
+
+
+class CachedListMixin:
+    """Serve list responses from the cache until the user's data changes.
+
+    Cached entries are keyed on a per-user version that every write through
+    these viewsets bumps, so a hit skips both the query and serialization.
+    Disabled unless the cache backend is shared between workers.
+    """
+
+    def list(self, request, *args, **kwargs):
+        if not LIST_CACHE_ENABLED:
+            return super().list(request, *args, **kwargs)
+        key = list_cache_key(self.basename, request.user.pk, request.get_full_path())
+        data = cache.get(key)
+        if data is None:
+            data = super().list(request, *args, **kwargs).data
+            cache.set(key, data, LIST_CACHE_TIMEOUT)
+        return Response(data)
+
+    def perform_create(self, serializer):
+        super().perform_create(serializer)
+        bump_list_version(self.request.user.pk)
+
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
+        bump_list_version(self.request.user.pk)
+
+    def perform_destroy(self, instance):
+        super().perform_destroy(instance)
+        bump_list_version(self.request.user.pk)
+
+
+class SummaryListMixin:
+    """Let list requests opt out of the heavy JSON columns with ``?summary=true``.
+
+    Summary lists defer ``summary_deferred_fields`` in the query and use
+    ``summary_serializer_class``; every other action keeps the full payload.
+    """
+    summary_serializer_class = None
+    summary_deferred_fields = ()
+
+    def is_summary_list(self):
+        return self.action == 'list' and self.request.query_params.get('summary', '').lower() in ('1', 'true')
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.is_summary_list():
+            queryset = queryset.defer(*self.summary_deferred_fields)
+        return queryset
+
+    def get_serializer_class(self):
+        if self.is_summary_list():
+            return self.summary_serializer_class
+        return super().get_serializer_class()
+
+
+class SearchListMixin:
+    """Filter list results with ``?search=<terms>``.
+
+    Uses the trigger-maintained ``search_vector`` GIN index on PostgreSQL and
+    falls back to ``icontains`` over ``search_fields`` elsewhere.
+    """
+    search_fields = ()
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        terms = self.request.query_params.get('search', '').strip()
+        if self.action != 'list' or not terms:
+            return queryset
+        if connection.vendor == 'postgresql':
+            return queryset.filter(search_vector=SearchQuery(terms, config='english'))
+        condition = Q()
+        for field in self.search_fields:
+            condition |= Q(**{f'{field}__icontains': terms})
+        return queryset.filter(condition)
+
+
+class DatasetViewSet(CachedListMixin, SearchListMixin, viewsets.ModelViewSet):
     queryset = Dataset.objects.all()
     serializer_class = DatasetSerializer
+    search_fields = ('name', 'description')
     parser_classes = (MultiPartParser, FormParser)
     permission_classes = [IsAuthenticated]  # Require authentication
 
     def get_queryset(self):
         """Return datasets for the current user only"""
-        return Dataset.objects.filter(uploaded_by=self.request.user)
+        queryset = Dataset.objects.filter(uploaded_by=self.request.user)
+        if self.action in ('list', 'retrieve'):
+            queryset = queryset.defer('dataset_info')  # only preview reads it
+            recent_analyses = Analysis.objects.only(
+                'id', 'dataset', 'title', 'analysis_type', 'created_at'
+            ).order_by('-created_at')[:RECENT_ANALYSES_LIMIT]
+            queryset = queryset.prefetch_related(
+                Prefetch('analyses', queryset=recent_analyses, to_attr='recent_analyses')
+            )
+        return queryset
+
+    def perform_destroy(self, instance):
+        file_path = instance.file.path if instance.file else None
+        super().perform_destroy(instance)
+        if file_path:
+            DataAnalysisService.delete_parquet_sidecar(file_path)
 
     def create(self, request, *args, **kwargs):
         """Upload and process a new dataset"""
@@ -36,19 +146,36 @@ class DatasetViewSet(viewsets.ModelViewSet):
             if not file:
                 return Response({'error': 'No file provided'}, status=status.HTTP_400_BAD_REQUEST)
 
-            # Determine file type
             file_extension = os.path.splitext(file.name)[1].lower()
-            file_type = 'csv' if file_extension == '.csv' else 'excel' if file_extension in ['.xlsx', '.xls'] else 'unknown'
 
-            # Save file
-            file_path = default_storage.save(f'datasets/{uuid.uuid4()}{file_extension}', ContentFile(file.read()))
-            full_path = os.path.join(default_storage.location, file_path)
+            # Hash the upload in fixed-size chunks, then hand the file itself to
+            # storage so a spooled upload is moved into place rather than copied
+            checksum = hashlib.sha256()
+            for chunk in file.chunks(UPLOAD_CHUNK_SIZE):
+                checksum.update(chunk)
+            file.seek(0)
+            storage_name = f'datasets/{uuid.uuid4()}{file_extension}'
+            file_path = None
 
             # Analyze dataset
             try:
-                df = DataAnalysisService.read_dataset(full_path, file_type)
+                # Spooled uploads are parsed straight from their temp file, so
+                # files that fail to parse never reach media storage
+                if hasattr(file, 'temporary_file_path'):
+                    source_path = file.temporary_file_path()
+                else:
+                    file_path = default_storage.save(storage_name, file)
+                    source_path = os.path.join(default_storage.location, file_path)
+
+                file_type = DataAnalysisService.detect_file_type(source_path)
+                df = DataAnalysisService.read_dataset(source_path, file_type)
                 dataset_info = DataAnalysisService.get_dataset_info(df)
 
+                if file_path is None:
+                    file_path = default_storage.save(storage_name, file)
+                # Later previews and analyses load this instead of re-parsing the upload
+                DataAnalysisService.write_parquet_sidecar(df, os.path.join(default_storage.location, file_path))
+
                 # Create dataset object
                 dataset = Dataset.objects.create(
                     name=name,
@@ -58,8 +185,11 @@ class DatasetViewSet(viewsets.ModelViewSet):
                     rows_count=dataset_info['rows_count'],
                     columns_count=dataset_info['columns_count'],
                     file_type=file_type,
+                    checksum=checksum.hexdigest(),
+                    dataset_info=DataAnalysisService.clean_for_json(dataset_info),
                     uploaded_by=request.user
                 )
+                bump_list_version(request.user.pk)
 
                 serializer = DatasetSerializer(dataset)
                 response_data = serializer.data
@@ -69,45 +199,117 @@ class DatasetViewSet(viewsets.ModelViewSet):
 
             except Exception as e:
                 # Clean up file if analysis fails
-                if default_storage.exists(file_path):
+                if file_path and default_storage.exists(file_path):
+                    DataAnalysisService.delete_parquet_sidecar(default_storage.path(file_path))
                     default_storage.delete(file_path)
                 return Response({'error': f'Error processing file: {str(e)}'}, status=status.HTTP_400_BAD_REQUEST)
 
         except Exception as e:
             return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-    @action(detail=True, methods=['get'])
+    @action(detail=True, methods=['get'], renderer_classes=PREVIEW_RENDERERS)
     def preview(self, request, pk=None):
         """Get a preview of the dataset"""
         try:
             dataset = self.get_object()
-            df = DataAnalysisService.read_dataset(dataset.file.path)
+            if request.accepted_renderer.format == 'arrow':
+                return Response(self._preview_table(dataset))
+
+            key = preview_cache_key(dataset.pk, dataset.file.path)
+            preview_data = cache.get(key)
+            if preview_data is not None:
+                return Response(preview_data)
+
+            # Serve the head from the Parquet sidecar and the info captured at
+            # upload; only parse the whole file when either is missing
+            head = DataAnalysisService.read_sidecar_head(dataset.file.path, PREVIEW_ROWS)
+            cleaned_info = dataset.dataset_info
+            if head is None or cleaned_info is None:
+                df = DataAnalysisService.read_dataset_cached(dataset.file.path)
+                head = df.head(PREVIEW_ROWS)
+                if cleaned_info is None:
+                    cleaned_info = DataAnalysisService.clean_for_json(DataAnalysisService.get_dataset_info(df))
+                    Dataset.objects.filter(pk=dataset.pk).update(dataset_info=cleaned_info)
 
             # Clean the data to handle NaN values properly
-            raw_data = df.head(10).to_dict('records')
+            raw_data = head.to_dict('records')
             cleaned_data = DataAnalysisService.clean_for_json(raw_data)
-            cleaned_info = DataAnalysisService.clean_for_json(DataAnalysisService.get_dataset_info(df))
 
             preview_data = {
-                'columns': df.columns.tolist(),
+                'columns': head.columns.tolist(),
                 'data': cleaned_data,
                 'info': cleaned_info
             }
+            cache.set(key, preview_data, PREVIEW_CACHE_TIMEOUT)
 
             return Response(preview_data)
 
         except Exception as e:
             return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-
-class AnalysisViewSet(viewsets.ModelViewSet):
+    def _preview_table(self, dataset):
+        """Preview rows as an Arrow table, with the dataset info JSON in the schema metadata"""
+        table = DataAnalysisService.read_sidecar_table(dataset.file.path, PREVIEW_ROWS)
+        info = dataset.dataset_info
+        if table is None or info is None:
+            df = DataAnalysisService.read_dataset_cached(dataset.file.path)
+            if table is None:
+                table = pa.Table.from_pandas(df.head(PREVIEW_ROWS), preserve_index=False)
+            if info is None:
+                info = DataAnalysisService.clean_for_json(DataAnalysisService.get_dataset_info(df))
+        metadata = dict(table.schema.metadata or {})
+        metadata[b'dataset_info'] = orjson.dumps(info)
+        return table.replace_schema_metadata(metadata)
+
+
+def _quick_analysis(df, parameters, include_visualizations):
+    """Comprehensive quick analysis"""
+    return {
+        'descriptive': DataAnalysisService.descriptive_statistics(
+            df, include_visualizations=include_visualizations
+        ),
+        'correlation': DataAnalysisService.correlation_analysis(
+            df, include_visualizations=include_visualizations
+        ),
+        'dataset_info': DataAnalysisService.get_dataset_info(df)
+    }
+
+
+# analysis_type -> handler(df, parameters, include_visualizations)
+ANALYSIS_HANDLERS = {
+    'descriptive': lambda df, p, viz: DataAnalysisService.descriptive_statistics(
+        df, p.get('columns'), p.get('include_box', False), viz
+    ),
+    'correlation': lambda df, p, viz: DataAnalysisService.correlation_analysis(
+        df, p.get('method', 'pearson'), viz
+    ),
+    'regression': lambda df, p, viz: DataAnalysisService.linear_regression_analysis(
+        df, p.get('target_column'), p.get('feature_columns'), viz
+    ),
+    'clustering': lambda df, p, viz: DataAnalysisService.clustering_analysis(
+        df, p.get('n_clusters', 3), p.get('features'), viz
+    ),
+    'classification': lambda df, p, viz: DataAnalysisService.classification_analysis(
+        df, p.get('target_column'), p.get('feature_columns')
+    ),
+    'quick_analysis': _quick_analysis,
+    'visualization': lambda df, p, viz: DataAnalysisService.create_visualization(
+        df, p.get('chart_type', 'histogram'), p
+    ),
+}
+
+
+class AnalysisViewSet(CachedListMixin, SummaryListMixin, SearchListMixin, viewsets.ModelViewSet):
     queryset = Analysis.objects.all()
     serializer_class = AnalysisSerializer
+    search_fields = ('title', 'description')
+    summary_serializer_class = AnalysisListSerializer
+    summary_deferred_fields = ('parameters', 'results')
     permission_classes = [IsAuthenticated]  # Require authentication
 
     def get_queryset(self):
         """Return analyses for datasets owned by the current user"""
-        return Analysis.objects.filter(dataset__uploaded_by=self.request.user)
+        return Analysis.objects.filter(dataset__uploaded_by=self.request.user).select_related('dataset')
 
     def create(self, request, *args, **kwargs):
         """Create a new analysis"""
@@ -117,43 +319,21 @@ class AnalysisViewSet(viewsets.ModelViewSet):
                 return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
             data = serializer.validated_data
-            dataset = Dataset.objects.get(id=data['dataset_id'])
-
-            # Load dataset
-            df = DataAnalysisService.read_dataset(dataset.file.path)
+            # Only the fields the analysis and its response use
+            dataset = Dataset.objects.only('id', 'name', 'file').get(id=data['dataset_id'])
 
             # Perform analysis based on type
             analysis_type = data['analysis_type']
+            handler = ANALYSIS_HANDLERS.get(analysis_type)
+            if handler is None:
+                return Response({'error': 'Unsupported analysis type'}, status=status.HTTP_400_BAD_REQUEST)
             parameters = data.get('parameters', {})
+            include_visualizations = parameters.get('include_visualizations', True)
 
-            if analysis_type == 'descriptive':
-                results = DataAnalysisService.descriptive_statistics(df, parameters.get('columns'))
-            elif analysis_type == 'correlation':
-                results = DataAnalysisService.correlation_analysis(df, parameters.get('method', 'pearson'))
-            elif analysis_type == 'regression':
-                results = DataAnalysisService.linear_regression_analysis(
-                    df, parameters.get('target_column'), parameters.get('feature_columns')
-                )
-            elif analysis_type == 'clustering':
-                results = DataAnalysisService.clustering_analysis(
-                    df, parameters.get('n_clusters', 3), parameters.get('features')
-                )
-            elif analysis_type == 'classification':
-                results = DataAnalysisService.classification_analysis(
-                    df, parameters.get('target_column'), parameters.get('feature_columns')
-                )
-            elif analysis_type == 'quick_analysis':
-                # Comprehensive quick analysis
-                results = {
-                    'descriptive': DataAnalysisService.descriptive_statistics(df),
-                    'correlation': DataAnalysisService.correlation_analysis(df),
-                    'dataset_info': DataAnalysisService.get_dataset_info(df)
-                }
-            elif analysis_type == 'visualization':
-                chart_type = parameters.get('chart_type', 'histogram')
-                results = DataAnalysisService.create_visualization(df, chart_type, parameters)
-            else:
-                return Response({'error': 'Unsupported analysis type'}, status=status.HTTP_400_BAD_REQUEST)
+            # Load dataset
+            df = DataAnalysisService.read_dataset_cached(dataset.file.path)
+
+            results = handler(df, parameters, include_visualizations)
 
             # Clean results for JSON serialization
             cleaned_results = DataAnalysisService.clean_for_json(results)
@@ -167,6 +347,7 @@ class AnalysisViewSet(viewsets.ModelViewSet):
                 parameters=parameters,
                 results=cleaned_results
             )
+            bump_list_version(request.user.pk)
 
             serializer = AnalysisSerializer(analysis)
             return Response(serializer.data, status=status.HTTP_201_CREATED)
@@ -181,21 +362,30 @@ class AnalysisViewSet(viewsets.ModelViewSet):
         """Perform enhanced quick analysis on a dataset"""
         try:
             dataset_id = request.data.get('dataset_id')
-            dataset = Dataset.objects.get(id=dataset_id)
+            dataset = Dataset.objects.only('id', 'file').get(id=dataset_id)
 
-            df = DataAnalysisService.read_dataset(dataset.file.path)
+            df = DataAnalysisService.read_dataset_cached(dataset.file.path)
 
             # Clean the dataset first
             df_clean = DataAnalysisService._clean_dataset(df)
+            include_visualizations = request.data.get('include_visualizations', True)
 
-            # Perform comprehensive quick analyses
+            # Perform comprehensive quick analyses, sharing one dtype scan and
+            # one Pearson correlation matrix
+            dtype_idx = DataAnalysisService._dtype_index(df_clean)
+            numeric_cols = dtype_idx[0]
+            corr_matrix = df_clean[numeric_cols].corr() if len(numeric_cols) else None
             results = {
-                'descriptive': DataAnalysisService.descriptive_statistics(df_clean),
-                'correlation': DataAnalysisService.correlation_analysis(df_clean),
-                'dataset_info': DataAnalysisService.get_dataset_info(df_clean),
-                'data_quality': DataAnalysisService._analyze_data_quality(df_clean),
-                'ai_insights': DataAnalysisService._generate_ai_insights(df_clean),
-                'visualization_recommendations': DataAnalysisService._get_visualization_recommendations(df_clean)
+                'descriptive': DataAnalysisService.descriptive_statistics(
+                    df_clean, include_visualizations=include_visualizations
+                ),
+                'correlation': DataAnalysisService.correlation_analysis(
+                    df_clean, include_visualizations=include_visualizations, corr_matrix=corr_matrix
+                ),
+                'dataset_info': DataAnalysisService.get_dataset_info(df_clean, dtype_idx),
+                'data_quality': DataAnalysisService._analyze_data_quality(df_clean, dtype_idx),
+                'ai_insights': DataAnalysisService._generate_ai_insights(df_clean, dtype_idx, corr_matrix),
+                'visualization_recommendations': DataAnalysisService._get_visualization_recommendations(df_clean, dtype_idx)
             }
 
             # Clean all results for JSON serialization
@@ -208,14 +398,18 @@ class AnalysisViewSet(viewsets.ModelViewSet):
             return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
-class VisualizationViewSet(viewsets.ModelViewSet):
+class VisualizationViewSet(CachedListMixin, SummaryListMixin, viewsets.ModelViewSet):
     queryset = Visualization.objects.all()
     serializer_class = VisualizationSerializer
+    summary_serializer_class = VisualizationListSerializer
+    summary_deferred_fields = ('config', 'data')
     permission_classes = [IsAuthenticated]  # Require authentication
 
     def get_queryset(self):
         """Return visualizations for analyses owned by the current user"""
-        return Visualization.objects.filter(analysis__dataset__uploaded_by=self.request.user)
+        return Visualization.objects.filter(
+            analysis__dataset__uploaded_by=self.request.user
+        ).select_related('analysis')
 
     def create(self, request, *args, **kwargs):
         """Create a new visualization"""
@@ -225,11 +419,14 @@ class VisualizationViewSet(viewsets.ModelViewSet):
             title = request.data.get('title')
             config = request.data.get('config', {})
 
-            analysis = Analysis.objects.get(id=analysis_id)
+            # One join instead of a second query, and skip the stored results JSON
+            analysis = Analysis.objects.select_related('dataset').only(
+                'id', 'title', 'dataset', 'dataset__file'
+            ).get(id=analysis_id)
             dataset = analysis.dataset
 
             # Load dataset
-            df = DataAnalysisService.read_dataset(dataset.file.path)
+            df = DataAnalysisService.read_dataset_cached(dataset.file.path)
 
             # Create visualization
             viz_result = DataAnalysisService.create_visualization(df, chart_type, config)
@@ -245,6 +442,7 @@ class VisualizationViewSet(viewsets.ModelViewSet):
                 config=config,
                 data=viz_result['visualization']
             )
+            bump_list_version(request.user.pk)
 
             serializer = VisualizationSerializer(visualization)
             return Response(serializer.data, status=status.HTTP_201_CREATED)
@@ -70,6 +70,10 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Report per-request SQL query counts while developing
+if DEBUG:
+    MIDDLEWARE.append('analytics.middleware.QueryCountMiddleware')
+
 ROOT_URLCONF = 'data_analysis_api.urls'
 
 TEMPLATES = [
@@ -93,14 +97,44 @@ WSGI_APPLICATION = 'data_analysis_api.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# IMMEDIATE transactions take the write lock up front instead of failing with
+# "database is locked" on upgrade. WAL lets readers run alongside a writer, but
+# journal_mode is persisted in the database file, so it is opt-in (the deploy
+# sets SQLITE_WAL) and routine manage.py runs leave the local db.sqlite3 alone.
+SQLITE_WAL = os.environ.get('SQLITE_WAL', 'False').lower() == 'true'
+SQLITE_OPTIONS = {
+    'transaction_mode': 'IMMEDIATE',
+}
+if SQLITE_WAL:
+    SQLITE_OPTIONS['init_command'] = 'PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL;'
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'CONN_MAX_AGE': 60,
+        'OPTIONS': SQLITE_OPTIONS,
     }
 }
 
 
+# Cache - Redis when REDIS_URL is set, otherwise per-process memory
+REDIS_URL = os.environ.get('REDIS_URL')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -152,12 +186,11 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'analytics.renderers.ORJSONRenderer',
     ],
     'DEFAULT_PARSER_CLASSES': [
-        'rest_framework.parsers.JSONParser',
+        'analytics.parsers.ORJSONParser',
         'rest_framework.parsers.MultiPartParser',
-        'rest_framework.parsers.FileUploadParser',
     ]
 }
 
@@ -191,4 +224,6 @@ STATIC_URL = '/static/'
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 
 # File upload settings
-FILE_UPLOAD_MAX_MEMORY_SIZE = 50 * 1024 * 1024  # 50MB
+FILE_UPLOAD_MAX_MEMORY_SIZE = 2_621_440  # 2.5MB
+# Always spool uploads to a temporary file instead of holding them in memory
+FILE_UPLOAD_HANDLERS = ['django.core.files.uploadhandler.TemporaryFileUploadHandler']
@@ -15,3 +15,10 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'data_analysis_api.settings_render')
 
 application = get_wsgi_application()
+
+# Resolve the URLconf now so the views (and pandas/scikit-learn behind them) are
+# imported once in the gunicorn master when running with --preload, and shared
+# copy-on-write by the forked workers. Nothing here opens a database connection.
+from django.urls import get_resolver  # noqa: E402
+
+get_resolver().url_patterns
@@ -13,12 +13,7 @@ pip install -r requirements.txt
 # Set Django settings
 export DJANGO_SETTINGS_MODULE=data_analysis_api.settings_render
 
-# Collect static files
-echo "Collecting static files..."
-python manage.py collectstatic --noinput --clear
-
-# Run database migrations
-echo "Running database migrations..."
-python manage.py migrate --noinput
+# Collect static files and run database migrations in one Django process
+python manage.py bootstrap --noinput --clear
 
 echo "Build completed successfully!"